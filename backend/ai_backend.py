@@ -0,0 +1,415 @@
+# backend/ai_backend.py
+# The interface the app talks to for text generation. Backends yield the model output
+# as a sequence of text chunks, so callers can either stream them to the client as
+# they arrive or join them into the full response.
+#
+# Every call goes through the same client policy in AIBackend.stream: at most
+# max_concurrency calls in flight per process, and transient failures before the
+# first chunk retried with exponential backoff and full jitter. Providers only
+# implement _open_stream.
+#
+# Token usage is reported by the provider when it can, otherwise estimated with
+# estimate_tokens, and handed back through the optional `usage` dict.
+#
+# Q&A generation is asked for as JSON Lines (one {"question", "suggested_answer"}
+# object per line), which lets a streamed Q&A list be parsed item by item.
+import hashlib
+import itertools
+import json
+import random
+import re
+import socket
+import threading
+import time
+
+import backoff
+import requests
+from requests.adapters import HTTPAdapter
+
+_END_OF_STREAM = object()
+
+# CJK characters are roughly one token each; other text roughly four characters per token
+_CJK_CHARACTER = re.compile(r'[\u3000-\u303f\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff\uff00-\uffef]')
+
+
+def estimate_tokens(text):
+    if not text:
+        return 0
+    cjk_count = len(_CJK_CHARACTER.findall(text))
+    other_count = len(text) - cjk_count - text.count(' ')
+    return cjk_count + (other_count + 3) // 4
+
+
+class AIBackendError(Exception):
+    pass
+
+
+class TransientAIError(AIBackendError):
+    # Worth retrying: timeouts, dropped connections, rate limiting, 5xx
+    pass
+
+
+class AIBackendBusy(AIBackendError):
+    # No concurrency slot became free within acquire_timeout
+    pass
+
+
+class AIBackend:
+    def __init__(self, max_concurrency=8, acquire_timeout=30, max_tries=3, backoff_factor=0.5, max_backoff=8):
+        self.max_concurrency = max_concurrency
+        self.acquire_timeout = acquire_timeout
+        self.max_tries = max_tries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+        self._counters_lock = threading.Lock()
+        self._counters = {
+            'calls': 0, 'in_flight': 0, 'retries': 0, 'failures': 0, 'busy': 0,
+            'prompt_tokens': 0, 'completion_tokens': 0,
+        }
+
+    # `context` carries the structured fields the prompt was built from. Real backends
+    # only need the prompt; the stub uses the context to fake plausible output.
+    def stream(self, task, prompt, context=None, usage=None):
+        if not self._slots.acquire(timeout=self.acquire_timeout):
+            self._count('busy')
+            raise AIBackendBusy(f'No AI slot free after {self.acquire_timeout}s ({self.max_concurrency} calls in flight)')
+        self._count('calls')
+        self._count('in_flight')
+        reported_usage = {}
+        output = []
+        try:
+            for chunk in self._open_with_retry(task, prompt, context, reported_usage):
+                output.append(chunk)
+                yield chunk
+        except AIBackendError:
+            self._count('failures')
+            raise
+        finally:
+            self._count('in_flight', -1)
+            self._slots.release()
+
+        prompt_tokens = reported_usage.get('prompt_tokens', estimate_tokens(prompt))
+        completion_tokens = reported_usage.get('completion_tokens', estimate_tokens(''.join(output)))
+        self._count('prompt_tokens', prompt_tokens)
+        self._count('completion_tokens', completion_tokens)
+        if usage is not None:
+            usage['prompt_tokens'] = prompt_tokens
+            usage['completion_tokens'] = completion_tokens
+
+    def complete(self, task, prompt, context=None, usage=None):
+        return ''.join(self.stream(task, prompt, context, usage))
+
+    def _open_with_retry(self, task, prompt, context, usage):
+        # Only the part before the first chunk is retried; once output has reached
+        # the caller a retry would duplicate it
+        def open_first_chunk():
+            chunks = self._open_stream(task, prompt, context, usage)
+            return chunks, next(chunks, _END_OF_STREAM)
+
+        open_first_chunk = backoff.on_exception(
+            backoff.expo,
+            TransientAIError,
+            max_tries=self.max_tries,
+            factor=self.backoff_factor,
+            max_value=self.max_backoff,
+            jitter=backoff.full_jitter,
+            on_backoff=lambda details: self._count('retries'),
+            raise_on_giveup=True
+        )(open_first_chunk)
+
+        chunks, first_chunk = open_first_chunk()
+        if first_chunk is _END_OF_STREAM:
+            return iter(())
+        return itertools.chain([first_chunk], chunks)
+
+    def _open_stream(self, task, prompt, context, usage):
+        # Return an iterator of text chunks; raise TransientAIError for retryable failures.
+        # Providers that know the real token counts put them in `usage` by the end of the stream.
+        raise NotImplementedError
+
+    def _count(self, name, delta=1):
+        with self._counters_lock:
+            self._counters[name] += delta
+
+    def stats(self):
+        with self._counters_lock:
+            stats = dict(self._counters)
+        stats['max_concurrency'] = self.max_concurrency
+        return stats
+
+
+class HTTPAIBackend(AIBackend):
+    # Any OpenAI-compatible /chat/completions endpoint, streamed. One pooled session is
+    # shared by all threads, sized so every concurrency slot can keep a connection alive.
+    def __init__(self, base_url, api_key, model, connect_timeout=5, read_timeout=60, total_timeout=180,
+                 pool_size=None, **kwargs):
+        super().__init__(**kwargs)
+        self.url = base_url.rstrip('/') + '/chat/completions'
+        self.model = model
+        self.timeout = (connect_timeout, read_timeout) # read_timeout bounds each wait between chunks
+        # read_timeout alone lets a slowly trickling stream hold its slot forever; this
+        # bounds a whole attempt, from sending the request to the last chunk
+        self.total_timeout = total_timeout
+
+        self.session = requests.Session()
+        self.session.headers['Authorization'] = f'Bearer {api_key}'
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size or self.max_concurrency, pool_block=True)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def _open_stream(self, task, prompt, context, usage):
+        deadline = time.monotonic() + self.total_timeout
+        try:
+            response = self.session.post(
+                self.url,
+                json={
+                    'model': self.model,
+                    'stream': True,
+                    'stream_options': {'include_usage': True},
+                    'messages': [{'role': 'user', 'content': prompt}]
+                },
+                timeout=self.timeout,
+                stream=True
+            )
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise TransientAIError(f'AI request failed: {e}') from e
+
+        if response.status_code == 429 or response.status_code >= 500:
+            response.close()
+            raise TransientAIError(f'AI provider returned HTTP {response.status_code}')
+        if response.status_code != 200:
+            body = response.text[:200]
+            response.close()
+            raise AIBackendError(f'AI provider returned HTTP {response.status_code}: {body}')
+        return self._iter_content(response, usage, deadline, self.total_timeout)
+
+    @staticmethod
+    def _iter_content(response, usage, deadline, total_timeout):
+        # Event streams usually come without a charset, which requests would read as Latin-1
+        response.encoding = 'utf-8'
+        # A read blocked on a trickling stream only notices the deadline if the socket is
+        # shut down under it, so a timer does that when the deadline passes
+        aborted = threading.Event()
+        watchdog = threading.Timer(max(0.0, deadline - time.monotonic()), _abort_stream, (response, aborted))
+        watchdog.daemon = True
+        watchdog.start()
+        deadline_error = f'AI call exceeded its {total_timeout}s deadline'
+        with response:
+            try:
+                for line in response.iter_lines(decode_unicode=True):
+                    if aborted.is_set() or time.monotonic() > deadline:
+                        raise AIBackendError(deadline_error)
+                    if not line or not line.startswith('data:'):
+                        continue
+                    payload = line[5:].strip()
+                    if payload == '[DONE]':
+                        break
+                    text = _event_content(payload, usage)
+                    if text:
+                        yield text
+                else:
+                    if aborted.is_set():
+                        raise AIBackendError(deadline_error)
+            except (requests.ConnectionError, requests.Timeout, requests.exceptions.ChunkedEncodingError) as e:
+                if aborted.is_set():
+                    raise AIBackendError(deadline_error) from e
+                # Mid-stream failures are transient too; they are retried only if
+                # nothing had been yielded yet
+                raise TransientAIError(f'AI stream interrupted: {e}') from e
+            finally:
+                watchdog.cancel()
+
+
+def _event_content(payload, usage):
+    # The text delta of one chat-completion stream event, recording token usage if the event
+    # carries it; anything not shaped like such an event is an AIBackendError
+    error = f'AI provider sent a malformed stream event: {payload[:200]}'
+    try:
+        event = json.loads(payload)
+    except ValueError as e:
+        raise AIBackendError(error) from e
+    if not isinstance(event, dict):
+        raise AIBackendError(error)
+
+    # Sent in a final chunk with no choices when include_usage is set; null in the others
+    event_usage = event.get('usage')
+    if event_usage is not None:
+        if not isinstance(event_usage, dict):
+            raise AIBackendError(error)
+        usage['prompt_tokens'] = event_usage.get('prompt_tokens', 0)
+        usage['completion_tokens'] = event_usage.get('completion_tokens', 0)
+
+    choices = event.get('choices')
+    if not choices:
+        return None
+    if not isinstance(choices, list) or not isinstance(choices[0], dict):
+        raise AIBackendError(error)
+    delta = choices[0].get('delta')
+    if delta is None:
+        return None
+    if not isinstance(delta, dict):
+        raise AIBackendError(error)
+    text = delta.get('content')
+    if text is not None and not isinstance(text, str):
+        raise AIBackendError(error)
+    return text
+
+
+def _abort_stream(response, aborted):
+    aborted.set()
+    try:
+        # Shutting down a duplicate of the descriptor ends the connection under the reader
+        with socket.fromfd(response.raw.fileno(), socket.AF_INET, socket.SOCK_STREAM) as sock:
+            sock.shutdown(socket.SHUT_RDWR)
+    except (OSError, ValueError):
+        response.close() # Connection already gone or not a socket
+
+
+class StubAIBackend(AIBackend):
+    # Local, deterministic stand-in for a model provider, for development and load tests.
+    # Each call waits `latency` seconds before the first chunk, then emits the canned
+    # output one line at a time with chunk_delay seconds between lines. failure_rate
+    # makes that share of calls fail transiently, from a seeded RNG so runs repeat.
+    def __init__(self, latency=0.0, chunk_delay=0.1, failure_rate=0.0, seed=0, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+        self.chunk_delay = chunk_delay
+        self.failure_rate = failure_rate
+        self._random = random.Random(seed)
+        self._random_lock = threading.Lock()
+
+    def _open_stream(self, task, prompt, context, usage):
+        context = context or {}
+        if task == 'pre_match':
+            chunks = [self._pre_match_text()]
+        elif task == 'generate_qa':
+            chunks = [json.dumps(qa_item, ensure_ascii=False) + '\n' for qa_item in self._qa_list(prompt)]
+        elif task == 'generate_resume':
+            chunks = self._resume_md(context).splitlines(keepends=True)
+        elif task == 'evaluate_session':
+            chunks = [json.dumps(self._session_evaluation(prompt, context), ensure_ascii=False)]
+        else:
+            raise AIBackendError(f'Unknown AI task: {task}')
+
+        if self.latency:
+            time.sleep(self.latency)
+        if self.failure_rate:
+            with self._random_lock:
+                failed = self._random.random() < self.failure_rate
+            if failed:
+                raise TransientAIError('Simulated AI provider failure')
+        return self._emit(chunks)
+
+    def _emit(self, chunks):
+        for index, chunk in enumerate(chunks):
+            if index and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield chunk
+
+    @staticmethod
+    def _pre_match_text():
+        return "[模拟结果] 您的简历与该岗位匹配度较高。您的Python和Flask技能非常吻合。建议在简历中更具体地描述您在React项目中的角色和贡献，以进一步提升竞争力。"
+
+    @staticmethod
+    def _qa_list(prompt):
+        # Between 3 and 5 questions, fixed for a given prompt
+        num_questions = 3 + int(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), 16) % 3
+        return [
+            {
+                "question": "请介绍一下你参与过的最有挑战性的项目，你在其中扮演了什么角色，遇到了什么困难，以及如何解决的？",
+                "suggested_answer": "建议使用STAR原则（情境、任务、行动、结果）来组织回答，突出你在项目中的贡献和解决问题的能力。"
+            },
+            {
+                "question": "你对我们公司有什么了解？为什么选择我们公司？",
+                "suggested_answer": "建议提前研究公司官网、新闻报道和产品，结合自身兴趣和职业规划，真诚表达对公司的认同和向往。"
+            },
+            {
+                "question": "你认为自己最大的优点和缺点是什么？",
+                "suggested_answer": "优点要结合岗位要求，举例说明；缺点要选择不影响核心工作能力的，并说明你如何改进。"
+            },
+            {
+                "question": "你对未来的职业发展有什么规划？",
+                "suggested_answer": "结合个人兴趣和行业发展趋势，展示清晰的职业目标和为之努力的计划。"
+            },
+            {
+                "question": "你有什么问题想问我们吗？",
+                "suggested_answer": "准备2-3个有深度的问题，体现你对公司和岗位的思考，例如关于团队文化、项目挑战或个人成长机会。"
+            }
+        ][:num_questions]
+
+    @staticmethod
+    def _session_evaluation(prompt, context):
+        # Scores derived from the prompt, so the same transcripts always get the same report
+        seed = int(hashlib.sha256(prompt.encode('utf-8')).hexdigest(), 16)
+        dimension_scores = {}
+        for index, dimension in enumerate(("沟通能力", "技术深度", "逻辑思维", "解决问题能力", "学习潜力")):
+            dimension_scores[dimension] = 60 + (seed >> (index * 8)) % 36
+        return {
+            "overall_score": round(sum(dimension_scores.values()) / len(dimension_scores)),
+            "report_summary": "[模拟AI总结] 本次面试表现良好，对技术问题理解深入，但沟通表达能力有待提升。",
+            "radar_chart_data": dimension_scores,
+            "feedback": [
+                {
+                    "answer_id": answer['answer_id'],
+                    "feedback": f"[模拟AI反馈] 针对问题 \"{answer['question_text']}\"，您的回答流畅，但可以进一步结合具体项目经验来支撑您的观点。建议在表达时更突出您的个人贡献。"
+                }
+                for answer in context.get('answers', [])
+            ]
+        }
+
+    @staticmethod
+    def _resume_md(context):
+        position_name = context.get('position_name', '')
+        company_name = context.get('company_name', '')
+        keywords = context.get('keywords', '')
+        return f"""# 张三 - {position_name} 定制简历
+
+---
+
+### 联系方式
+- **电话**: 138-1234-5678
+- **邮箱**: zhangsan@email.com
+- **GitHub**: github.com/zhangsan
+
+### 核心优势 (针对 {company_name})
+
+- **技术匹配**: 熟练掌握 **Python** 和 **Flask** 框架，与岗位要求的技术栈高度契合。
+- **经验丰富**: 拥有完整的Web应用开发和部署经验，尤其在图书管理系统项目中，独立完成了从设计到部署的全过程。
+- **关键词突出**: {f'在项目中重点应用了 **{keywords}** 等技术。' if keywords else '对岗位要求的各项技能有深入理解。'}
+
+### 项目经历
+
+**基于Python的图书管理系统 (课程设计)**
+- **技术栈**: Flask, SQLite, Nginx
+- **项目描述**: 独立设计并开发了一个支持多人在线借阅的图书管理系统，旨在提升校园图书流转效率。
+- **我的职责**:
+  - 实现了用户的注册、登录、图书查询、借阅和归还等核心功能。
+  - 设计了数据库模式，并使用 SQLAlchemy 进行数据操作。
+  - 通过 Nginx 将应用部署在个人服务器上，积累了基本的Linux运维知识。
+
+*（更多项目细节和校园经历请参考完整版简历）*
+"""
+
+
+def parse_qa_lines(text):
+    # Turn a JSON Lines Q&A response into a list, skipping blank or malformed lines
+    qa_list = []
+    for line in text.splitlines():
+        qa_item = parse_qa_line(line)
+        if qa_item is not None:
+            qa_list.append(qa_item)
+    return qa_list
+
+
+def parse_qa_line(line):
+    line = line.strip()
+    if not line:
+        return None
+    try:
+        qa_item = json.loads(line)
+    except ValueError:
+        return None
+    if not isinstance(qa_item, dict) or 'question' not in qa_item:
+        return None
+    return qa_item
@@ -0,0 +1,96 @@
+# backend/audio_store.py
+# On-disk storage for recorded answers. An upload in progress is a partial file that
+# chunks are written into at their offset; a finished upload is hashed and moved to a
+# content-addressed blob (blobs/<first two hex digits>/<sha256>), so the same recording
+# uploaded twice is stored once. Request bodies are copied in READ_SIZE blocks, so memory
+# per upload stays constant whatever the file size. Nothing here depends on Flask.
+import hashlib
+import os
+import re
+import time
+
+READ_SIZE = 64 * 1024
+SHA256_PATTERN = re.compile(r'[0-9a-f]{64}')
+
+
+class AudioStore:
+    def __init__(self, root):
+        self.partial_folder = os.path.join(root, 'partial')
+        self.blob_folder = os.path.join(root, 'blobs')
+        os.makedirs(self.partial_folder, exist_ok=True)
+        os.makedirs(self.blob_folder, exist_ok=True)
+
+    def partial_path(self, upload_id):
+        return os.path.join(self.partial_folder, upload_id)
+
+    def blob_path(self, sha256):
+        return os.path.join(self.blob_folder, sha256[:2], sha256)
+
+    def partial_size(self, upload_id):
+        try:
+            return os.path.getsize(self.partial_path(upload_id))
+        except FileNotFoundError:
+            return 0
+
+    def write_chunk(self, upload_id, offset, read, length):
+        # Copy up to length bytes from read(n) into the partial file at offset, replacing
+        # anything after it (the tail of an earlier, interrupted chunk). Returns the number
+        # of bytes written, which is short when read() runs dry (client went away).
+        if self.partial_size(upload_id) < offset:
+            raise ValueError(f'Partial upload {upload_id} is shorter than offset {offset}')
+        written = 0
+        fd = os.open(self.partial_path(upload_id), os.O_RDWR | os.O_CREAT, 0o644)
+        with os.fdopen(fd, 'r+b') as partial:
+            partial.truncate(offset)
+            partial.seek(offset)
+            while written < length:
+                block = read(min(READ_SIZE, length - written))
+                if not block:
+                    break
+                partial.write(block)
+                written += len(block)
+        return written
+
+    def digest(self, upload_id):
+        sha256 = hashlib.sha256()
+        with open(self.partial_path(upload_id), 'rb') as partial:
+            for block in iter(lambda: partial.read(READ_SIZE), b''):
+                sha256.update(block)
+        return sha256.hexdigest()
+
+    def commit(self, upload_id, sha256):
+        # Move a finished upload to its blob. Returns False when the blob already existed
+        # (the upload is a duplicate and is simply dropped).
+        blob_path = self.blob_path(sha256)
+        if os.path.exists(blob_path):
+            self.discard(upload_id)
+            return False
+        os.makedirs(os.path.dirname(blob_path), exist_ok=True)
+        os.replace(self.partial_path(upload_id), blob_path)
+        return True
+
+    def discard(self, upload_id):
+        _remove_quietly(self.partial_path(upload_id))
+
+    def remove_blob(self, sha256):
+        _remove_quietly(self.blob_path(sha256))
+
+    def evict_stale_partials(self, max_age_seconds):
+        # Partial files nobody has written to for max_age_seconds (abandoned uploads)
+        cutoff = time.time() - max_age_seconds
+        removed = 0
+        for entry in os.scandir(self.partial_folder):
+            try:
+                if entry.is_file() and entry.stat().st_mtime < cutoff:
+                    os.remove(entry.path)
+                    removed += 1
+            except FileNotFoundError:
+                pass
+        return removed
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -0,0 +1,84 @@
+# backend/bench_ai_provider.py
+# Load test for the AI client policy (concurrency slots, retries) using the stub
+# provider, so AI_MAX_CONCURRENCY can be tuned without network access. Each client
+# thread issues full completions back to back, like AI jobs and streams would.
+#
+#   python bench_ai_provider.py --requests 200 --clients 32 --concurrency 4 8 16 --latency 0.5
+import argparse
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from ai_backend import AIBackendError, StubAIBackend
+
+PROMPT = "请根据以下用户简历和岗位描述（JD），为用户生成5个高频面试问题及对应的建议答案。"
+
+
+def run(args, max_concurrency):
+    backend = StubAIBackend(
+        latency=args.latency,
+        chunk_delay=args.chunk_delay,
+        failure_rate=args.failure_rate,
+        max_concurrency=max_concurrency,
+        acquire_timeout=args.acquire_timeout,
+        max_tries=args.max_tries,
+        backoff_factor=args.backoff_factor
+    )
+    timings = []
+    errors = []
+    lock = threading.Lock()
+
+    def one_call(index):
+        start = time.perf_counter()
+        try:
+            backend.complete('generate_qa', f"{PROMPT} #{index}")
+        except AIBackendError as e:
+            with lock:
+                errors.append(type(e).__name__)
+            return
+        with lock:
+            timings.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.clients) as executor:
+        list(executor.map(one_call, range(args.requests)))
+    elapsed = time.perf_counter() - start
+
+    timings.sort()
+    stats = backend.stats()
+    return {
+        'throughput': len(timings) / elapsed,
+        'p50': statistics.median(timings) if timings else 0.0,
+        'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))] if timings else 0.0,
+        'ok': len(timings),
+        'errors': len(errors),
+        'retries': stats['retries'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test AI concurrency settings against the stub provider')
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--clients', type=int, default=32, help='Concurrent callers (job workers + open streams)')
+    parser.add_argument('--concurrency', type=int, nargs='+', default=[2, 4, 8, 16], help='AI_MAX_CONCURRENCY values to compare')
+    parser.add_argument('--latency', type=float, default=0.5, help='Seconds before the first chunk')
+    parser.add_argument('--chunk-delay', type=float, default=0.02)
+    parser.add_argument('--failure-rate', type=float, default=0.0)
+    parser.add_argument('--acquire-timeout', type=float, default=30)
+    parser.add_argument('--max-tries', type=int, default=3)
+    parser.add_argument('--backoff-factor', type=float, default=0.1)
+    args = parser.parse_args()
+
+    print(f"{args.requests} calls from {args.clients} clients, latency {args.latency}s, failure rate {args.failure_rate}")
+    for max_concurrency in args.concurrency:
+        result = run(args, max_concurrency)
+        print(
+            f"concurrency {max_concurrency:>3}   {result['throughput']:7.1f} calls/s   "
+            f"p50 {result['p50'] * 1000:8.1f} ms   p95 {result['p95'] * 1000:8.1f} ms   "
+            f"ok {result['ok']}   errors {result['errors']}   retries {result['retries']}"
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,131 @@
+# backend/bench_audio_upload.py
+# Uploads recordings through the chunked audio endpoints with many clients at once and
+# reports the server's peak memory (VmHWM, Linux only) next to the volume uploaded. The
+# server runs in its own process (threaded werkzeug server on a scratch SQLite database),
+# so client-side buffers do not count; with request bodies streamed to disk its peak
+# should barely move as the number of concurrent uploads grows.
+#
+#   python bench_audio_upload.py [--clients 1 12 48] [--size-mb 8]
+import argparse
+import http.client
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+SERVER = '''
+from werkzeug.serving import make_server
+from app import app, init_database
+import init_db
+init_database()
+init_db.create_test_data()
+server = make_server('127.0.0.1', 0, app, threaded=True)
+print('PORT', server.server_port, flush=True)
+server.serve_forever()
+'''
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark concurrent chunked audio uploads')
+    parser.add_argument('--clients', type=int, nargs='+', default=[1, 12, 48])
+    parser.add_argument('--size-mb', type=int, default=8)
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix='bench_audio_')
+    env = dict(
+        os.environ,
+        DATABASE_URL='sqlite:///' + os.path.join(scratch_dir, 'bench.db'),
+        GENERATION_CACHE_PATH=os.path.join(scratch_dir, 'generation_cache.db'),
+        AUDIO_STORAGE_PATH=os.path.join(scratch_dir, 'audio'),
+        AI_STUB_LATENCY='0', AI_STUB_CHUNK_DELAY='0', SQLITE_BUSY_TIMEOUT_MS='30000'
+    )
+    server = subprocess.Popen(
+        [sys.executable, '-c', SERVER], cwd=os.path.dirname(os.path.abspath(__file__)), env=env,
+        stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True
+    )
+    try:
+        line = ''
+        while not line.startswith('PORT '): # app.py prints INFO lines while importing
+            line = server.stdout.readline()
+            if not line:
+                raise RuntimeError('Benchmark server exited during startup')
+        port = int(line.split()[1])
+        run(port, server.pid, args.clients, args.size_mb * 1024 * 1024)
+    finally:
+        server.terminate()
+        server.wait()
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def _peak_rss_mb(pid):
+    with open(f'/proc/{pid}/status') as status:
+        for line in status:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) / 1024
+    return float('nan')
+
+
+def _request(port, method, path, body=None, headers=None):
+    connection = http.client.HTTPConnection('127.0.0.1', port, timeout=120)
+    try:
+        connection.request(method, path, body=body, headers=headers or {})
+        response = connection.getresponse()
+        return response.status, json.loads(response.read() or b'null')
+    finally:
+        connection.close()
+
+
+def _upload(port, session_id, answer_id, size, errors):
+    # Every client sends different bytes, so nothing is deduplicated away
+    status, upload = _request(
+        port, 'POST', f'/interview_session/{session_id}/answers/{answer_id}/audio',
+        json.dumps({'size': size, 'content_type': 'audio/mpeg'}), {'Content-Type': 'application/json'}
+    )
+    if status != 201:
+        errors.append(upload)
+        return
+    chunk = os.urandom(upload['chunk_size'])
+    offset = 0
+    while offset < size:
+        body = chunk[:size - offset]
+        status, state = _request(
+            port, 'PUT', f"/audio_uploads/{upload['upload_id']}?offset={offset}", body,
+            {'Content-Type': 'application/octet-stream'}
+        )
+        if status != 200:
+            errors.append(state)
+            return
+        offset = state['offset']
+
+
+def run(port, server_pid, client_counts, size):
+    _, session = _request(port, 'POST', '/opportunity/1/interview_sessions')
+    answer_ids = [answer['id'] for answer in session['session_answers']]
+    baseline = _peak_rss_mb(server_pid)
+    print(f"server peak RSS before uploads  {baseline:8.1f} MB")
+
+    for clients in client_counts:
+        errors = []
+        threads = [
+            threading.Thread(target=_upload, args=(port, session['id'], answer_ids[i % len(answer_ids)], size, errors))
+            for i in range(clients)
+        ]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+        uploaded_mb = clients * size / 1024 / 1024
+        print(
+            f"{clients:3d} concurrent x {size / 1024 / 1024:.0f} MB   {uploaded_mb:7.0f} MB in {elapsed:6.2f} s"
+            f"   server peak RSS {_peak_rss_mb(server_pid):8.1f} MB   errors {len(errors)}"
+        )
+
+
+if __name__ == '__main__':
+    main()
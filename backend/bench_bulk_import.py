@@ -0,0 +1,65 @@
+# backend/bench_bulk_import.py
+# Compares importing N opportunities one POST /opportunities at a time against a
+# single POST /opportunities/bulk, on a scratch SQLite database.
+#
+#   python bench_bulk_import.py [--rows 200]
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark per-row vs bulk opportunity import')
+    parser.add_argument('--rows', type=int, default=200)
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix='bench_bulk_')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(scratch_dir, 'bench.db')
+    os.environ['GENERATION_CACHE_PATH'] = os.path.join(scratch_dir, 'generation_cache.db')
+    try:
+        run(args.rows)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def run(row_count):
+    from app import app, init_database # Imported after DATABASE_URL is set
+
+    init_database()
+    client = app.test_client()
+    openid = 'bench_user'
+    client.post('/users', json={'openid': openid})
+
+    rows = [
+        {
+            'position_name': f'后端工程师 {i}',
+            'company_name': f'公司 {i}',
+            'job_description': '负责核心后端服务开发，要求熟悉Python/Go，有高并发系统设计经验。' * 5,
+            'source': '官网',
+            'status': '已投递',
+            'latest_progress': '简历评估中'
+        }
+        for i in range(row_count)
+    ]
+
+    start = time.perf_counter()
+    for row in rows:
+        response = client.post('/opportunities', json={'user_openid': openid, **row})
+        assert response.status_code == 201, response.get_json()
+    per_row_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    response = client.post('/opportunities/bulk', json={'user_openid': openid, 'opportunities': rows})
+    bulk_seconds = time.perf_counter() - start
+    assert response.status_code == 201 and response.get_json()['created'] == row_count, response.get_json()
+
+    print(f"\n{row_count} opportunities")
+    print(f"per-row POST /opportunities   {per_row_seconds * 1000:9.1f} ms   {row_count / per_row_seconds:10.0f} rows/s")
+    print(f"POST /opportunities/bulk      {bulk_seconds * 1000:9.1f} ms   {row_count / bulk_seconds:10.0f} rows/s")
+    print(f"speedup                       {per_row_seconds / bulk_seconds:9.1f}x")
+
+
+if __name__ == '__main__':
+    main()
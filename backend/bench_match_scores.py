@@ -0,0 +1,155 @@
+# backend/bench_match_scores.py
+# Times GET /opportunities/<openid>/match_scores for users with 1k and 10k opportunities
+# on a scratch SQLite database: the first (cold) request vectorizes every JD, later ones
+# reuse the cached vectors, and after editing 1% of the JDs only those are rebuilt. A
+# plain-Python loop scoring the same cached vectors one opportunity at a time is timed
+# for comparison with the batched NumPy path.
+#
+#   python bench_match_scores.py [--sizes 1000 10000] [--repeat 5]
+import argparse
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import time
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark resume/JD match scoring')
+    parser.add_argument('--sizes', type=int, nargs='+', default=[1000, 10000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix='bench_match_')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(scratch_dir, 'bench.db')
+    os.environ['GENERATION_CACHE_PATH'] = os.path.join(scratch_dir, 'generation_cache.db')
+    try:
+        run(args.sizes, args.repeat)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def _job_description(rng, skill_terms):
+    skills = rng.sample(skill_terms, 8)
+    return (
+        f"岗位职责：负责{skills[0]}与{skills[1]}相关系统的设计和开发，参与{skills[2]}平台建设。\n"
+        f"任职要求：熟悉{skills[3]}、{skills[4]}，了解{skills[5]}；有{skills[6]}或{skills[7]}经验者优先。"
+        f" Strong ownership, experience with {rng.choice(skill_terms)} at scale."
+    )
+
+
+def _timed(func, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _python_loop_scores(resume_vector, opportunity_vectors, idf):
+    # The same coverage score computed one opportunity at a time, without NumPy
+    resume_columns = set(resume_vector[0].tolist())
+    idf = idf.tolist()
+    scores = []
+    for _, (columns, weights) in opportunity_vectors:
+        total = covered = 0.0
+        for column, weight in zip(columns.tolist(), weights.tolist()):
+            weighted = weight * idf[column]
+            total += weighted
+            if column in resume_columns:
+                covered += weighted
+        scores.append(round(covered / total * 100) if total > 0 else None)
+    return scores
+
+
+def run(sizes, repeat):
+    # Imported after DATABASE_URL is set
+    from app import (
+        app, db, init_database, rebuild_keyword_stats, match_vectors, User, Opportunity,
+        _opportunity_match_vectors, _resume_match_vector, _keyword_document_frequencies, _jd_document_count
+    )
+    import match_scorer
+    from keyword_extractor import SKILL_TERMS
+
+    init_database()
+    client = app.test_client()
+    rng = random.Random(0)
+    skill_terms = list(SKILL_TERMS)
+    resume = '\n'.join(f"- 熟练使用 {term}" for term in rng.sample(skill_terms, 25))
+
+    for size in sizes:
+        openid = f'bench_user_{size}'
+        with app.app_context():
+            user = User(openid=openid, name='bench', profile_content=resume)
+            db.session.add(user)
+            db.session.commit()
+            user_id = user.id
+            db.session.execute(db.insert(Opportunity), [
+                {
+                    'user_id': user_id, 'position_name': f'工程师 {i}', 'company_name': f'公司 {i}',
+                    'job_description': _job_description(rng, skill_terms), 'status': '已投递'
+                }
+                for i in range(size)
+            ])
+            db.session.commit()
+            rebuild_keyword_stats()
+
+        url = f'/opportunities/{openid}/match_scores'
+
+        def request_scores():
+            response = client.get(url)
+            assert response.status_code == 200 and len(response.get_json()) == size, response.status_code
+
+        stats_before = match_vectors.stats()
+        cold = _timed(request_scores, 1)
+        warm = _timed(request_scores, repeat)
+
+        # Edit 1% of the JDs, plus another 1% where only the status changes (text unchanged)
+        with app.app_context():
+            ids = [opportunity_id for (opportunity_id,) in db.session.query(Opportunity.id).filter_by(user_id=user_id)]
+            for opportunity_id in rng.sample(ids, max(1, size // 100)):
+                opportunity = db.session.get(Opportunity, opportunity_id)
+                opportunity.job_description = _job_description(rng, skill_terms)
+            for opportunity_id in rng.sample(ids, max(1, size // 100)):
+                db.session.get(Opportunity, opportunity_id).status = '面试中'
+            db.session.commit()
+        stats_after_edit = match_vectors.stats()
+        after_edit = _timed(request_scores, 1)
+        stats_after = match_vectors.stats()
+
+        with app.app_context():
+            user = db.session.get(User, user_id)
+            resume_vector = _resume_match_vector(user)
+            opportunity_vectors = _opportunity_match_vectors(user_id)
+            stacked = match_scorer.stack_rows([vector for _, vector in opportunity_vectors])
+            columns = match_scorer.distinct_columns(stacked)
+            terms = match_vectors.terms(columns)
+            document_frequencies = _keyword_document_frequencies(terms)
+            idf = match_scorer.idf_weights(
+                columns, [document_frequencies.get(term, 0) for term in terms],
+                _jd_document_count(), match_vectors.vocabulary_size()
+            )
+        batched_ms = _timed(lambda: match_scorer.match_scores(
+            resume_vector, match_scorer.stack_rows([vector for _, vector in opportunity_vectors]),
+            len(opportunity_vectors), idf
+        ), repeat)
+        loop_ms = _timed(lambda: _python_loop_scores(resume_vector, opportunity_vectors, idf), repeat)
+        assert match_scorer.match_scores(resume_vector, stacked, len(opportunity_vectors), idf) == \
+            _python_loop_scores(resume_vector, opportunity_vectors, idf)
+
+        print(f"\n{size} opportunities")
+        print(f"cold request (vectorize all)     {cold:9.1f} ms   vectorized {stats_after_edit['vectorized'] - stats_before['vectorized']}")
+        print(f"warm request (cached vectors)    {warm:9.1f} ms")
+        print(
+            f"after editing 1% / touching 1%   {after_edit:9.1f} ms   "
+            f"vectorized {stats_after['vectorized'] - stats_after_edit['vectorized']}, "
+            f"reused {stats_after['reused'] - stats_after_edit['reused']}"
+        )
+        print(f"scoring only, batched NumPy      {batched_ms:9.2f} ms")
+        print(f"scoring only, per-row Python     {loop_ms:9.2f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,141 @@
+# backend/bench_pdf_render.py
+# Micro-benchmark for resume PDF rendering: the original per-request pipeline
+# (path lookups, @font-face re-embedding the CJK font, f-string HTML wrapper)
+# against pdf_renderer.ResumeRenderer with the font registered once.
+#
+#   python bench_pdf_render.py [--font /path/to/NotoSansSC-Regular.ttf] [--runs 20]
+import argparse
+import io
+import os
+import shutil
+import statistics
+import tempfile
+import time
+
+import markdown
+from xhtml2pdf import pisa
+
+import pdf_renderer
+
+SAMPLE_RESUME_MD = """# 张三 - 后端工程师 定制简历
+
+---
+
+### 联系方式
+- **电话**: 138-1234-5678
+- **邮箱**: zhangsan@email.com
+- **GitHub**: github.com/zhangsan
+
+### 核心优势
+- **技术匹配**: 熟练掌握 **Python** 和 **Flask** 框架，与岗位要求的技术栈高度契合。
+- **经验丰富**: 拥有完整的Web应用开发和部署经验。
+
+### 项目经历
+
+**基于Python的图书管理系统 (课程设计)**
+- **技术栈**: Flask, SQLite, Nginx
+- 实现了用户的注册、登录、图书查询、借阅和归还等核心功能。
+- 通过 Nginx 将应用部署在个人服务器上，积累了基本的Linux运维知识。
+"""
+
+
+def render_legacy(resume_md, static_folder):
+    # The body of generate_pdf_route before the renderer module existed
+    temp_folder = os.path.join(static_folder, 'temp')
+    font_folder = os.path.join(static_folder, 'fonts')
+    os.makedirs(temp_folder, exist_ok=True)
+    os.makedirs(font_folder, exist_ok=True)
+
+    font_name = "NotoSansSC"
+    font_filepath = os.path.join(font_folder, "NotoSansSC-Regular.ttf")
+
+    def link_callback(uri, rel):
+        if uri.startswith("/static/"):
+            return os.path.join(static_folder, uri.replace("/static/", ""))
+        return uri
+
+    if os.path.exists(font_filepath):
+        font_family_css = f"font-family: '{font_name}', sans-serif;"
+    else:
+        font_family_css = "font-family: \"SimHei\", sans-serif;"
+
+    html_content = markdown.markdown(resume_md)
+    html = f"""
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <style>
+            @font-face {{
+                font-family: "NotoSansSC";
+                src: url("/static/fonts/NotoSansSC-Regular.ttf") format("truetype");
+            }}
+            body {{ {font_family_css} line-height: 1.6; }}
+            h1 {{ font-size: 22pt; border-bottom: 2px solid #333; padding-bottom: 4px; margin-bottom: 0.8em; }}
+            h2 {{ font-size: 18pt; border-bottom: 1px solid #ccc; padding-bottom: 2px; margin-top: 1.5em; margin-bottom: 0.5em; }}
+            h3 {{ font-size: 14pt; margin-top: 1.2em; margin-bottom: 0.4em; }}
+            ul {{ list-style-type: disc; padding-left: 20px; margin-bottom: 1em; }}
+            li {{ margin-bottom: 0.5em; }}
+            strong {{ font-weight: bold; }}
+            p {{ margin-bottom: 1em; }}
+        </style>
+    </head>
+    <body>
+        {html_content}
+    </body>
+    </html>
+    """
+    pisa_status = pisa.CreatePDF(src=html, dest=io.BytesIO(), link_callback=link_callback)
+    return not pisa_status.err
+
+
+def time_renders(render, runs):
+    render() # Warm-up, excluded from the numbers
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        render()
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return {
+        'p50': statistics.median(timings),
+        'p95': timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        'mean': statistics.mean(timings),
+    }
+
+
+def main():
+    backend_folder = os.path.dirname(os.path.abspath(__file__))
+    default_font = os.path.join(backend_folder, 'static', 'fonts', pdf_renderer.FONT_FILENAME)
+    parser = argparse.ArgumentParser(description='Benchmark resume PDF rendering latency')
+    parser.add_argument('--font', default=default_font, help='TTF font to use as NotoSansSC-Regular.ttf')
+    parser.add_argument('--runs', type=int, default=20)
+    args = parser.parse_args()
+
+    # Keep the scratch static folder under backend/, where xhtml2pdf is allowed to read fonts from
+    static_folder = tempfile.mkdtemp(prefix='bench_pdf_', dir=backend_folder)
+    try:
+        os.makedirs(os.path.join(static_folder, 'fonts'))
+        if os.path.exists(args.font):
+            shutil.copy(args.font, os.path.join(static_folder, 'fonts', pdf_renderer.FONT_FILENAME))
+            print(f"Using font {args.font}")
+        else:
+            print(f"WARNING: Font {args.font} not found, both pipelines fall back to the system font")
+
+        renderer = pdf_renderer.ResumeRenderer(static_folder)
+        output_filepath = os.path.join(renderer.temp_folder, 'bench.pdf')
+
+        results = {
+            'before (per-request setup)': time_renders(lambda: render_legacy(SAMPLE_RESUME_MD, static_folder), args.runs),
+            'after (preloaded renderer)': time_renders(lambda: renderer.render(SAMPLE_RESUME_MD, output_filepath), args.runs),
+        }
+    finally:
+        shutil.rmtree(static_folder, ignore_errors=True)
+
+    print(f"\n{args.runs} renders each")
+    for label, stats in results.items():
+        print(f"{label:<28} p50 {stats['p50']:8.1f} ms   p95 {stats['p95']:8.1f} ms   mean {stats['mean']:8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
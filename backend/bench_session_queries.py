@@ -0,0 +1,94 @@
+# backend/bench_session_queries.py
+# Checks that the session listing, latest-session and assessment endpoints run the same
+# number of SQL statements however many sessions (and answers) they return, i.e. that
+# answers are eager-loaded rather than fetched once per session. Each endpoint is counted
+# with query_counter at the smallest size, then asserted at every larger size; the run
+# fails with the offending statements if a count drifts. Uses a scratch SQLite database.
+#
+#   python bench_session_queries.py [--sessions 1 10 50] [--answers 10]
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+ENDPOINTS = (
+    '/opportunity/<id>/interview_sessions',
+    '/opportunity/<id>/interview_sessions?summary=1',
+    '/opportunity/<id>/interview_sessions/latest',
+    '/assessments/latest/<openid>',
+    '/assessments/latest/<openid>?summary=1',
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Check that session endpoints run a fixed number of queries')
+    parser.add_argument('--sessions', type=int, nargs='+', default=[1, 10, 50])
+    parser.add_argument('--answers', type=int, default=10)
+    args = parser.parse_args()
+
+    scratch_dir = tempfile.mkdtemp(prefix='bench_sessions_')
+    os.environ['DATABASE_URL'] = 'sqlite:///' + os.path.join(scratch_dir, 'bench.db')
+    os.environ['GENERATION_CACHE_PATH'] = os.path.join(scratch_dir, 'generation_cache.db')
+    try:
+        run(sorted(args.sessions), args.answers)
+    finally:
+        shutil.rmtree(scratch_dir, ignore_errors=True)
+
+
+def _create_sessions(app, db, openid, session_count, answer_count):
+    from app import InterviewSession, Opportunity, SessionAnswer, User
+
+    with app.app_context():
+        user = User(openid=openid, name=openid)
+        db.session.add(user)
+        db.session.flush()
+        opportunity = Opportunity(user_id=user.id, position_name='后端工程师', company_name='公司', status='面试中')
+        db.session.add(opportunity)
+        db.session.flush()
+        start = datetime.utcnow() - timedelta(days=session_count)
+        for i in range(session_count):
+            session = InterviewSession(
+                opportunity_id=opportunity.id, session_date=start + timedelta(days=i), overall_score=60 + i % 40,
+                report_summary='总结', radar_chart_data='{}'
+            )
+            session.session_answers = [
+                SessionAnswer(question_text=f'问题 {j}', suggested_answer='参考答案', user_answer_transcript='回答')
+                for j in range(answer_count)
+            ]
+            db.session.add(session)
+        db.session.commit()
+        return opportunity.id
+
+
+def run(session_counts, answer_count):
+    from app import app, db, init_database # Imported after DATABASE_URL is set
+    from query_counter import assert_query_count, count_queries
+
+    init_database()
+    client = app.test_client()
+    expected = {}
+    for session_count in session_counts:
+        openid = f'bench_user_{session_count}'
+        opportunity_id = _create_sessions(app, db, openid, session_count, answer_count)
+        print(f"\n{session_count} sessions x {answer_count} answers")
+        with app.app_context():
+            for key in ENDPOINTS:
+                endpoint = key.replace('<id>', str(opportunity_id)).replace('<openid>', openid)
+                start = time.perf_counter()
+                if key in expected:
+                    with assert_query_count(db.engine, expected[key]) as counter:
+                        response = client.get(endpoint)
+                else:
+                    with count_queries(db.engine) as counter:
+                        response = client.get(endpoint)
+                    expected[key] = counter.count
+                elapsed = time.perf_counter() - start
+                assert response.status_code == 200, response.get_json()
+                print(f"{key:48s} {counter.count:3d} queries {elapsed * 1000:8.1f} ms")
+    print("\nQuery counts do not grow with the number of sessions.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+# backend/conftest.py
+# pytest setup. app.py reads its configuration from the environment at import time, so the
+# scratch database, generation cache and audio folder are set here, before any test module
+# imports it; the stub AI provider answers instantly.
+import os
+import shutil
+import tempfile
+import time
+
+import pytest
+
+_scratch_dir = tempfile.mkdtemp(prefix='interview_tests_')
+os.environ.update(
+    DATABASE_URL='sqlite:///' + os.path.join(_scratch_dir, 'test.db'),
+    GENERATION_CACHE_PATH=os.path.join(_scratch_dir, 'generation_cache.db'),
+    AUDIO_STORAGE_PATH=os.path.join(_scratch_dir, 'audio'),
+    AI_PROVIDER='stub', AI_STUB_LATENCY='0', AI_STUB_CHUNK_DELAY='0', AI_STUB_FAILURE_RATE='0',
+)
+
+
+def pytest_sessionfinish(session, exitstatus):
+    shutil.rmtree(_scratch_dir, ignore_errors=True)
+
+
+@pytest.fixture
+def client():
+    # Test client over freshly seeded data (test_user_001 with 10 opportunities), empty cache
+    import init_db
+    from app import app, generation_cache
+
+    init_db.create_test_data()
+    generation_cache.clear()
+    return app.test_client()
+
+
+@pytest.fixture
+def wait_for_job(client):
+    # wait_for_job(job_id) polls /jobs/<id> until the job has finished and returns it
+    def wait(job_id, timeout=5):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            job = client.get(f'/jobs/{job_id}').get_json()
+            if job['status'] not in ('pending', 'running'):
+                return job
+            time.sleep(0.05)
+        raise AssertionError(f'Job {job_id} did not finish within {timeout}s')
+    return wait
@@ -0,0 +1,135 @@
+# backend/document_patch.py
+# Server-side application of client edits, so saving a resume or a Q&A list uploads the
+# change instead of the whole document. Text edits are splices on the previous text;
+# structured edits are RFC 6902 JSON Patch operations. Edits that do not apply to the
+# document they are given raise PatchError.
+import copy
+
+
+class PatchError(ValueError):
+    pass
+
+
+def apply_text_edits(text, edits):
+    # edits: [{'offset': int, 'delete': int, 'insert': str}], applied in order, each to the
+    # result of the previous one. Offsets and lengths count UTF-16 code units, which is what
+    # JavaScript string indices are, so a client can compute them with plain slicing.
+    if not isinstance(edits, list):
+        raise PatchError('edits must be a list')
+    units = bytearray((text or '').encode('utf-16-le', 'surrogatepass'))
+    for edit in edits:
+        if not isinstance(edit, dict):
+            raise PatchError('Every edit must be an object')
+        offset = edit.get('offset')
+        delete = edit.get('delete', 0)
+        insert = edit.get('insert', '')
+        if type(offset) is not int or type(delete) is not int or offset < 0 or delete < 0:
+            raise PatchError('offset and delete must be non-negative integers')
+        if not isinstance(insert, str):
+            raise PatchError('insert must be a string')
+        if (offset + delete) * 2 > len(units):
+            raise PatchError('Edit reaches past the end of the text')
+        units[offset * 2:(offset + delete) * 2] = insert.encode('utf-16-le', 'surrogatepass')
+    try:
+        return units.decode('utf-16-le')
+    except UnicodeDecodeError:
+        raise PatchError('Edits split a character')
+
+
+def _parse_pointer(pointer):
+    # RFC 6901 JSON Pointer -> list of reference tokens
+    if not isinstance(pointer, str) or (pointer and not pointer.startswith('/')):
+        raise PatchError(f'Invalid JSON pointer: {pointer!r}')
+    if not pointer:
+        return []
+    return [token.replace('~1', '/').replace('~0', '~') for token in pointer[1:].split('/')]
+
+
+def _array_index(array, token, for_insert=False):
+    if for_insert and token == '-':
+        return len(array)
+    if not token.isdigit() or (len(token) > 1 and token.startswith('0')):
+        raise PatchError(f'Invalid array index: {token!r}')
+    index = int(token)
+    if index > len(array) or (index == len(array) and not for_insert):
+        raise PatchError(f'Array index out of range: {index}')
+    return index
+
+
+def _get(document, tokens):
+    value = document
+    for token in tokens:
+        if isinstance(value, list):
+            value = value[_array_index(value, token)]
+        elif isinstance(value, dict):
+            if token not in value:
+                raise PatchError(f'No member {token!r}')
+            value = value[token]
+        else:
+            raise PatchError(f'Cannot descend into {type(value).__name__}')
+    return value
+
+
+def _add(document, tokens, value):
+    if not tokens:
+        return value
+    parent = _get(document, tokens[:-1])
+    if isinstance(parent, list):
+        parent.insert(_array_index(parent, tokens[-1], for_insert=True), value)
+    elif isinstance(parent, dict):
+        parent[tokens[-1]] = value
+    else:
+        raise PatchError(f'Cannot add to {type(parent).__name__}')
+    return document
+
+
+def _remove(document, tokens):
+    # Returns (document, removed value)
+    if not tokens:
+        raise PatchError('Cannot remove the whole document')
+    parent = _get(document, tokens[:-1])
+    if isinstance(parent, list):
+        return document, parent.pop(_array_index(parent, tokens[-1]))
+    if isinstance(parent, dict):
+        if tokens[-1] not in parent:
+            raise PatchError(f'No member {tokens[-1]!r}')
+        return document, parent.pop(tokens[-1])
+    raise PatchError(f'Cannot remove from {type(parent).__name__}')
+
+
+def apply_json_patch(document, operations):
+    # Apply RFC 6902 operations to a copy of document; all of them apply or none do
+    if not isinstance(operations, list):
+        raise PatchError('patch must be a list of operations')
+    document = copy.deepcopy(document)
+    for operation in operations:
+        if not isinstance(operation, dict):
+            raise PatchError('Every operation must be an object')
+        op = operation.get('op')
+        path = _parse_pointer(operation.get('path'))
+        if op in ('add', 'replace', 'test') and 'value' not in operation:
+            raise PatchError(f'{op} needs a value')
+
+        if op == 'add':
+            document = _add(document, path, copy.deepcopy(operation['value']))
+        elif op == 'remove':
+            document, _ = _remove(document, path)
+        elif op == 'replace':
+            if path:
+                document, _ = _remove(document, path)
+            document = _add(document, path, copy.deepcopy(operation['value']))
+        elif op in ('move', 'copy'):
+            source = _parse_pointer(operation.get('from'))
+            if op == 'move':
+                if path[:len(source)] == source and len(path) > len(source):
+                    raise PatchError('Cannot move a value into itself')
+                document, value = _remove(document, source)
+            else:
+                value = copy.deepcopy(_get(document, source))
+            document = _add(document, path, value)
+        elif op == 'test':
+            if _get(document, path) != operation['value']:
+                raise PatchError(f"Test failed at {operation.get('path')!r}")
+        else:
+            raise PatchError(f'Unknown operation: {op!r}')
+    return document
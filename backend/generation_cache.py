@@ -0,0 +1,136 @@
+# backend/generation_cache.py
+# Two-tier cache for AI generations: an in-process LRU in front of a SQLite table.
+# Entries are keyed by a hash of the rendered prompt plus the model parameters, so
+# editing one opportunity never invalidates the results cached for another.
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import closing
+
+_MISSING = object()
+
+
+class GenerationCache:
+    def __init__(self, db_path, max_memory_entries=256, max_disk_entries=5000, ttl_seconds=7 * 24 * 3600):
+        self.db_path = db_path
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.ttl_seconds = ttl_seconds
+
+        self._lock = threading.Lock()
+        self._memory = OrderedDict() # key -> (expires_at, value)
+        self._counters = {'memory_hits': 0, 'disk_hits': 0, 'misses': 0, 'sets': 0, 'evictions': 0}
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS generation_cache (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    expires_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_generation_cache_expires_at ON generation_cache (expires_at)")
+            conn.execute("CREATE INDEX IF NOT EXISTS ix_generation_cache_last_access ON generation_cache (last_access)")
+
+    def _connect(self):
+        # One short-lived connection per operation keeps the cache usable from any worker thread
+        return sqlite3.connect(self.db_path, timeout=10)
+
+    @staticmethod
+    def make_key(prompt, params=None):
+        payload = json.dumps({'prompt': prompt, 'params': params or {}}, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+    def _remember(self, key, expires_at, value):
+        # Caller holds self._lock
+        self._memory[key] = (expires_at, value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_memory_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key, default=None):
+        now = time.time()
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if entry[0] > now:
+                    self._memory.move_to_end(key)
+                    self._counters['memory_hits'] += 1
+                    return entry[1]
+                del self._memory[key]
+
+        with closing(self._connect()) as conn, conn:
+            row = conn.execute(
+                "SELECT value, expires_at FROM generation_cache WHERE key = ? AND expires_at > ?", (key, now)
+            ).fetchone()
+            if row is not None:
+                conn.execute("UPDATE generation_cache SET last_access = ? WHERE key = ?", (now, key))
+
+        with self._lock:
+            if row is None:
+                self._counters['misses'] += 1
+                return default
+            value = json.loads(row[0])
+            self._remember(key, row[1], value)
+            self._counters['disk_hits'] += 1
+            return value
+
+    def set(self, key, value):
+        now = time.time()
+        expires_at = now + self.ttl_seconds
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO generation_cache (key, value, created_at, expires_at, last_access) VALUES (?, ?, ?, ?, ?)",
+                (key, json.dumps(value, ensure_ascii=False), now, expires_at, now)
+            )
+            evicted = self._evict(conn, now)
+        with self._lock:
+            self._remember(key, expires_at, value)
+            self._counters['sets'] += 1
+            self._counters['evictions'] += evicted
+
+    def _evict(self, conn, now):
+        # Drop expired rows first, then the least recently used rows beyond the size limit
+        evicted = conn.execute("DELETE FROM generation_cache WHERE expires_at <= ?", (now,)).rowcount
+        (count,) = conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()
+        overflow = count - self.max_disk_entries
+        if overflow > 0:
+            evicted += conn.execute(
+                "DELETE FROM generation_cache WHERE key IN "
+                "(SELECT key FROM generation_cache ORDER BY last_access LIMIT ?)", (overflow,)
+            ).rowcount
+        return evicted
+
+    def get_or_compute(self, prompt, params, compute, cacheable=None):
+        # cacheable(value) -> False keeps a computed value out of the cache (e.g. an empty
+        # generation), so the next call computes again instead of replaying it for the TTL
+        key = self.make_key(prompt, params)
+        value = self.get(key, _MISSING)
+        if value is _MISSING:
+            value = compute()
+            if cacheable is None or cacheable(value):
+                self.set(key, value)
+        return value
+
+    def clear(self):
+        with closing(self._connect()) as conn, conn:
+            conn.execute("DELETE FROM generation_cache")
+        with self._lock:
+            self._memory.clear()
+
+    def stats(self):
+        with closing(self._connect()) as conn:
+            (disk_entries,) = conn.execute("SELECT COUNT(*) FROM generation_cache").fetchone()
+        with self._lock:
+            stats = dict(self._counters)
+            stats['hits'] = stats['memory_hits'] + stats['disk_hits']
+            lookups = stats['hits'] + stats['misses']
+            stats['hit_rate'] = round(stats['hits'] / lookups, 4) if lookups else 0.0
+            stats['memory_entries'] = len(self._memory)
+            stats['disk_entries'] = disk_entries
+            return stats
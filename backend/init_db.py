@@ -1,14 +1,14 @@
 # backend/init_db.py
 import os
 from datetime import datetime
-from app import app, db, User, Opportunity # Import models and db from app.py
+from app import app, db, User, Opportunity, init_database, rebuild_keyword_stats, rebuild_search_index # Import models and db from app.py
 
 def create_test_data():
-    with app.app_context():
-        # Ensure tables are created if they don't exist
-        db.create_all()
-        print("Database tables ensured to be created.")
+    # Ensure tables are created if they don't exist
+    init_database()
+    print("Database tables ensured to be created.")
 
+    with app.app_context():
         # 2. Create or update a test user
         test_user_openid = "test_user_001"
         user_profile_content = """# 张三
@@ -90,20 +90,19 @@ def create_test_data():
             { 'position_name': '产品运营', 'company_name': '美团 (Meituan)', 'status': '已投递', 'latest_progress': '等待笔试通知', 'job_description': '负责美团外卖的用户增长和活动策划。', 'source': 'Boss直聘' }
         ]
 
-        for opp_data in mock_opportunities:
-            opportunity = Opportunity(
-                user_id=user.id,
-                position_name=opp_data['position_name'],
-                company_name=opp_data['company_name'],
-                job_description=opp_data['job_description'],
-                source=opp_data['source'],
-                status=opp_data['status'],
-                latest_progress=opp_data['latest_progress']
-            )
-            db.session.add(opportunity)
+        # Single multi-row INSERT instead of one ORM add per opportunity
+        db.session.execute(
+            db.insert(Opportunity),
+            [{'user_id': user.id, **opp_data} for opp_data in mock_opportunities]
+        )
         db.session.commit()
         print(f"{len(mock_opportunities)} test opportunities created for user '{user.name}'.")
 
+        # The bulk delete and insert above bypass the ORM events that maintain keyword statistics
+        # and the full-text search index
+        rebuild_keyword_stats()
+        rebuild_search_index()
+
         print("Test data generation complete.")
 
 if __name__ == '__main__':
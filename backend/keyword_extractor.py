@@ -0,0 +1,222 @@
+# backend/keyword_extractor.py
+# Local keyword extraction for job descriptions. Skills (SKILL_TERMS) and other common
+# Chinese JD words (WORD_TERMS) are found with one Aho-Corasick automaton, leftmost-longest,
+# which is a dictionary maximum-match segmentation of the Chinese; remaining English/
+# alphanumeric words are tokenized separately. Chinese text the dictionary does not cover
+# is split into overlapping character bigrams (runs first cut at function characters such
+# as 的/和). Bigrams are FRAGMENT terms: they count in document frequencies and match
+# vectors, but are never offered as keywords, since most of them (歌搜 in 谷歌搜索) are not
+# words. Candidates are ranked by TF-IDF against document frequencies of all stored job
+# descriptions, which the caller keeps up to date with document_terms().
+import math
+import re
+import string
+from collections import deque
+
+SKILL_TERMS = (
+    # Languages
+    "Python", "Java", "JavaScript", "TypeScript", "Go", "Golang", "C++", "C#", "Rust", "Kotlin",
+    "Swift", "Objective-C", "PHP", "Ruby", "Scala", "SQL", "Shell", "Lua", "Dart", "HTML", "CSS",
+    # Frontend / mobile
+    "React", "Vue", "Angular", "Node.js", "Next.js", "Webpack", "小程序", "Flutter", "React Native",
+    "iOS", "Android", "SwiftUI", "前端", "客户端", "移动端",
+    # Backend / infrastructure
+    "Flask", "Django", "FastAPI", "Spring", "Spring Boot", "Spring Cloud", "MyBatis", "gRPC", "RESTful",
+    "微服务", "分布式", "高并发", "高可用", "系统设计", "架构设计", "后端", "全栈", "中间件", "消息队列",
+    "MySQL", "PostgreSQL", "Oracle", "SQLite", "MongoDB", "Redis", "Elasticsearch", "Kafka", "RabbitMQ",
+    "HBase", "ClickHouse", "Nginx", "Linux", "Docker", "Kubernetes", "K8s", "CI/CD", "Jenkins", "Git",
+    "AWS", "Azure", "GCP", "阿里云", "云服务", "云计算", "DevOps", "运维", "网络安全",
+    # Data / AI
+    "数据分析", "数据挖掘", "数据仓库", "大数据", "数据可视化", "Hadoop", "Spark", "Flink", "Hive",
+    "机器学习", "深度学习", "强化学习", "自然语言处理", "NLP", "计算机视觉", "推荐系统", "推荐算法",
+    "搜索算法", "算法优化", "模型迭代", "大模型", "LLM", "PyTorch", "TensorFlow", "Pandas", "NumPy",
+    "A/B测试", "统计学", "Excel", "Tableau",
+    # Testing
+    "自动化测试", "性能测试", "测试框架", "单元测试", "Selenium", "测试开发",
+    # Product / operations / design
+    "产品规划", "产品设计", "需求分析", "用户增长", "用户研究", "用户体验", "交互设计", "竞品分析",
+    "活动策划", "内容运营", "用户运营", "数据驱动", "商业化", "电商", "游戏策划", "玩法设计", "数值策划",
+    "Axure", "Figma", "项目管理", "敏捷开发",
+    # General
+    "算法", "数据结构", "操作系统", "计算机网络", "团队协作", "沟通能力", "英语",
+)
+
+# Common JD vocabulary that is not a skill but makes a meaningful keyword. Dictionary words
+# are matched whole, so 游戏设计 yields 游戏 and 设计 rather than the fragment 戏设.
+WORD_TERMS = (
+    # Product areas
+    "搜索", "广告", "推荐", "社交", "游戏", "直播", "短视频", "视频", "音乐", "音视频", "支付", "金融", "风控",
+    "电商", "外卖", "本地生活", "出行", "地图", "教育", "医疗", "物流", "供应链", "社区", "内容", "资讯",
+    "智能硬件", "物联网", "自动驾驶", "机器人", "芯片", "安全", "隐私", "办公", "协同", "企业服务", "SaaS",
+    # Work and engineering
+    "开发", "设计", "研发", "测试", "维护", "优化", "架构", "重构", "性能", "稳定性", "可扩展性", "监控",
+    "部署", "存储", "数据库", "缓存", "网络", "接口", "平台", "工具链", "基础架构", "基础设施", "组件",
+    "界面", "交互", "动画", "渲染", "引擎", "图形", "服务端", "服务器", "跨平台", "框架",
+    "模型", "训练", "推理", "特征工程", "召回", "排序", "策略", "实验", "指标", "报表", "埋点", "画像",
+    "标注", "爬虫", "检索", "知识图谱", "语音识别", "图像识别", "多模态",
+    # Product, operations and business
+    "产品", "用户", "增长", "运营", "活动", "营销", "品牌", "市场", "销售", "商务", "客户", "渠道",
+    "策划", "玩法", "关卡", "剧情", "角色", "英雄", "皮肤", "平衡性", "版本", "迭代", "需求", "原型",
+    "文档", "流程", "项目", "管理", "协调", "沟通", "汇报", "调研", "分析", "规划", "落地", "上线",
+    # Traits
+    "责任心", "抗压能力", "学习能力", "执行力", "领导力", "创新", "英文", "海外", "国际化", "出海",
+)
+
+# Term kinds: dictionary skill, dictionary word or free English token, bigram fragment
+SKILL = 'skill'
+WORD = 'word'
+FRAGMENT = 'fragment'
+
+# Multiplier for dictionary skills over free words with the same TF-IDF
+SKILL_BOOST = 1.5
+
+_ASCII_LOWER = str.maketrans(string.ascii_uppercase, string.ascii_lowercase)
+_WORD = re.compile(r'[a-z][a-z0-9]*(?:[.\-/][a-z0-9]+)*[+#]*')
+_STOPWORDS = frozenset("""
+    a an and are as at be by can do for from has have in is it of on or our the to we will with you your
+    etc experience years year work working team good strong skills skill ability able plus responsible
+    familiar knowledge understanding related including least more than other using use based new
+""".split())
+_CJK_RUN = re.compile('[\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff]+') # CJK ideographs
+# Function characters never inside a keyword bigram: a run of ideographs is cut at them
+_CJK_BREAKS = frozenset("的了和与及或并等在是有为对从将把被也都而且之其以于向由")
+# JD boilerplate bigrams that say nothing about the job
+_CJK_STOPWORDS = frozenset("""
+    负责 要求 熟悉 熟练 掌握 了解 具备 具有 相关 经验 以上 优先 能够 良好 工作 岗位 职位 职责 描述
+    参与 进行 完成 我们 你将 公司 团队 任职 资格 学历 本科 年以上 不限 加分 一定 较强 能力
+""".split())
+
+
+def _is_word_char(char):
+    return char.isascii() and char.isalnum()
+
+
+class AhoCorasick:
+    # Multi-pattern matcher: reports every occurrence of every pattern in one pass
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]] # state -> [(pattern_length, value)]
+        for key, value in patterns:
+            state = 0
+            for char in key:
+                next_state = self._goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self._goto)
+                    self._goto[state][char] = next_state
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._output.append([])
+                state = next_state
+            self._output[state].append((len(key), value))
+
+        # Breadth-first failure links; each state also reports the matches of its fallback
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                candidate = self._goto[fallback].get(char, 0)
+                self._fail[next_state] = candidate if candidate != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def iter_matches(self, text):
+        # Yield (start, end, value) for every occurrence
+        state = 0
+        for index, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, value in self._output[state]:
+                yield index - length + 1, index + 1, value
+
+
+_dictionary_matcher = AhoCorasick(
+    [(term.translate(_ASCII_LOWER), (term, WORD)) for term in WORD_TERMS if term not in SKILL_TERMS] +
+    [(term.translate(_ASCII_LOWER), (term, SKILL)) for term in SKILL_TERMS]
+)
+
+
+def _dictionary_matches(lowered):
+    # Leftmost-longest, non-overlapping dictionary occurrences as (start, end, (term, kind)).
+    # English terms must sit on word boundaries, so "Go" is not found in "Google" nor "Java"
+    # in "JavaScript".
+    candidates = []
+    for start, end, term in _dictionary_matcher.iter_matches(lowered):
+        if _is_word_char(lowered[start]) and start > 0 and _is_word_char(lowered[start - 1]):
+            continue
+        if _is_word_char(lowered[end - 1]) and end < len(lowered) and _is_word_char(lowered[end]):
+            continue
+        candidates.append((start, -(end - start), end, term))
+    candidates.sort()
+
+    matches = []
+    covered_until = 0
+    for start, _, end, term in candidates:
+        if start >= covered_until:
+            matches.append((start, end, term))
+            covered_until = end
+    return matches
+
+
+def extract_terms(text):
+    # Terms of one text: {key: [display form, count, first position, kind]}
+    terms = {}
+    if not text:
+        return terms
+    lowered = text.translate(_ASCII_LOWER) # ASCII-only, so positions line up with `text`
+
+    masked = list(lowered)
+    for start, end, (term, kind) in _dictionary_matches(lowered):
+        key = term.translate(_ASCII_LOWER)
+        entry = terms.setdefault(key, [term, 0, start, kind])
+        entry[1] += 1
+        masked[start:end] = ' ' * (end - start)
+
+    for match in _WORD.finditer(''.join(masked)):
+        key = match.group()
+        if len(key) < 2 or key in _STOPWORDS or key.isdigit():
+            continue
+        entry = terms.setdefault(key, [text[match.start():match.end()], 0, match.start(), WORD])
+        entry[1] += 1
+
+    for start, bigram in _cjk_bigrams(''.join(masked)):
+        entry = terms.setdefault(bigram, [bigram, 0, start, FRAGMENT])
+        entry[1] += 1
+    return terms
+
+
+def _cjk_bigrams(text):
+    # (position, bigram) for every pair of adjacent ideographs; a run is cut at break
+    # characters and around stopword bigrams, so 负责推荐 yields 推荐 but not 责推
+    for run in _CJK_RUN.finditer(text):
+        breaks = [char in _CJK_BREAKS for char in run.group()]
+        for index in range(len(breaks) - 1):
+            if run.group()[index:index + 2] in _CJK_STOPWORDS:
+                breaks[index] = breaks[index + 1] = True
+        for index in range(len(breaks) - 1):
+            if not breaks[index] and not breaks[index + 1]:
+                yield run.start() + index, run.group()[index:index + 2]
+
+
+def document_terms(text):
+    # The keys a job description contributes to document frequencies (each counted once)
+    return set(extract_terms(text))
+
+
+def rank_keywords(text, document_frequencies, document_count, limit=8):
+    # TF-IDF ranking; document_frequencies maps key -> number of stored JDs containing it.
+    # Only skills and words are candidates; fragments just shape the frequencies.
+    scored = []
+    for key, (display, count, position, kind) in extract_terms(text).items():
+        if kind == FRAGMENT:
+            continue
+        document_frequency = document_frequencies.get(key, 0)
+        idf = math.log((1 + document_count) / (1 + document_frequency)) + 1
+        score = (1 + math.log(count)) * idf * (SKILL_BOOST if kind == SKILL else 1)
+        scored.append((-score, position, display))
+    scored.sort()
+    return [{'keyword': display, 'score': round(-negative_score, 4)} for negative_score, _, display in scored[:limit]]
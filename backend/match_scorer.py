@@ -0,0 +1,183 @@
+# backend/match_scorer.py
+# Local resume-to-JD match scores. Every text becomes a sparse term vector over the
+# keyword_extractor terms (sublinear tf, skill boost); a user's job descriptions are
+# stacked CSR-style and scored against the resume in one batched product. IDF is applied
+# at scoring time, so a cached vector depends only on its own text and is rebuilt only
+# when that text changes.
+#
+# The score is the share of a JD's TF-IDF weight covered by terms of the resume, i.e.
+# "how much of what this job asks for does the resume mention", as a 0-100 integer.
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+from keyword_extractor import SKILL, SKILL_BOOST, extract_terms
+
+_EMPTY_COLUMNS = np.zeros(0, dtype=np.int32)
+_EMPTY_WEIGHTS = np.zeros(0, dtype=np.float32)
+
+
+def text_fingerprint(text):
+    return hashlib.blake2b((text or '').encode('utf-8'), digest_size=16).digest()
+
+
+class VectorCache:
+    # Term vectors keyed by owner, e.g. ('opportunity', id). An entry is reused while the
+    # caller's version (updated_at, or the text fingerprint) matches; when the version moves
+    # but the text is the same, only the version is refreshed and nothing is re-extracted.
+    #
+    # Columns are not reused as the vocabulary grows, so the terms of evicted and discarded
+    # entries stay behind until it outgrows max_vocabulary; it is then rebuilt from the live
+    # entries and `generation` moves. Vectors handed out before a rebuild use the old columns,
+    # so callers that combine several read `generation` first and pass it to vocabulary().
+    def __init__(self, max_entries=50000, max_vocabulary=200000):
+        self.max_entries = max_entries
+        self.max_vocabulary = max_vocabulary
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # key -> (version, fingerprint, columns, weights)
+        self._vocabulary = {} # term key -> column
+        self._terms = [] # column -> term key
+        self._rebuild_at = max_vocabulary # Never below twice the live vocabulary, or it would rebuild on every put
+        self.generation = 0
+        self.vectorized = 0
+        self.reused = 0
+        self.rebuilds = 0
+
+    def get(self, key, version):
+        # (columns, weights), or None if the entry is missing or was built for another version
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] != version:
+                return None
+            self._entries.move_to_end(key)
+            return entry[2], entry[3]
+
+    def put(self, key, version, text):
+        fingerprint = text_fingerprint(text)
+        with self._lock:
+            entry = self._entries.get(key)
+            reused = entry is not None and entry[1] == fingerprint
+            if reused:
+                # By term rather than column, in case the vocabulary is rebuilt meanwhile
+                keys, weights = [self._terms[column] for column in entry[2]], entry[3]
+        if not reused:
+            keys, weights = self._vectorize(text)
+        with self._lock:
+            self._entries[key] = (version, fingerprint, self._columns(keys), weights)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            if len(self._terms) > self._rebuild_at:
+                self._rebuild_vocabulary()
+            if reused:
+                self.reused += 1
+            else:
+                self.vectorized += 1
+            return self._entries[key][2:]
+
+    def discard(self, keys):
+        # Drop the entries of deleted owners, or of owners whose text changed
+        with self._lock:
+            for key in keys:
+                self._entries.pop(key, None)
+
+    def terms(self, columns):
+        with self._lock:
+            return [self._terms[column] for column in columns]
+
+    def vocabulary(self, columns, generation):
+        # (terms of columns, vocabulary size) for vectors read at `generation`, or None if the
+        # vocabulary has been rebuilt since and those vectors must be read again
+        with self._lock:
+            if generation != self.generation:
+                return None
+            return [self._terms[column] for column in columns], len(self._terms)
+
+    def vocabulary_size(self):
+        with self._lock:
+            return len(self._terms)
+
+    def stats(self):
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'vocabulary': len(self._terms),
+                'vectorized': self.vectorized,
+                'reused': self.reused,
+                'vocabulary_rebuilds': self.rebuilds,
+            }
+
+    def _columns(self, keys):
+        # Caller holds self._lock
+        if not keys:
+            return _EMPTY_COLUMNS
+        columns = []
+        for key in keys:
+            column = self._vocabulary.get(key)
+            if column is None:
+                column = self._vocabulary[key] = len(self._terms)
+                self._terms.append(key)
+            columns.append(column)
+        return np.array(columns, dtype=np.int32)
+
+    def _rebuild_vocabulary(self):
+        # Caller holds self._lock. Renumber the terms still used by a live entry, in order of use.
+        old_terms = self._terms
+        self._vocabulary = {}
+        self._terms = []
+        for key, (version, fingerprint, columns, weights) in list(self._entries.items()):
+            self._entries[key] = (version, fingerprint, self._columns([old_terms[column] for column in columns]), weights)
+        self._rebuild_at = max(self.max_vocabulary, 2 * len(self._terms))
+        self.generation += 1
+        self.rebuilds += 1
+
+    @staticmethod
+    def _vectorize(text):
+        # (term keys, weights)
+        terms = extract_terms(text)
+        if not terms:
+            return [], _EMPTY_WEIGHTS
+        weights = [
+            (1 + math.log(count)) * (SKILL_BOOST if kind == SKILL else 1)
+            for _, count, _, kind in terms.values()
+        ]
+        return list(terms), np.array(weights, dtype=np.float32)
+
+
+def stack_rows(vectors):
+    # CSR parts of a row-per-vector matrix: (row index of every entry, columns, weights)
+    lengths = np.fromiter((len(columns) for columns, _ in vectors), dtype=np.int64, count=len(vectors))
+    if not lengths.sum():
+        return _EMPTY_COLUMNS.astype(np.int64), _EMPTY_COLUMNS, _EMPTY_WEIGHTS
+    rows = np.repeat(np.arange(len(vectors)), lengths)
+    columns = np.concatenate([columns for columns, _ in vectors])
+    weights = np.concatenate([weights for _, weights in vectors])
+    return rows, columns, weights
+
+
+def distinct_columns(stacked):
+    return np.unique(stacked[1])
+
+
+def idf_weights(columns, document_frequencies, document_count, size):
+    # Dense IDF array over the vocabulary; document_frequencies[i] belongs to columns[i]
+    idf = np.zeros(size, dtype=np.float32)
+    if len(columns):
+        frequencies = np.asarray(document_frequencies, dtype=np.float32)
+        idf[columns] = np.log((1 + document_count) / (1 + frequencies)) + 1
+    return idf
+
+
+def match_scores(resume_vector, stacked, row_count, idf):
+    # Score (0-100 int) of every stacked JD against the resume, None for JDs without terms
+    rows, columns, weights = stacked
+    resume_terms = np.zeros(len(idf), dtype=np.float32)
+    resume_terms[resume_vector[0]] = 1
+    weighted = weights * idf[columns]
+    totals = np.bincount(rows, weighted, minlength=row_count)
+    covered = np.bincount(rows, weighted * resume_terms[columns], minlength=row_count)
+    scores = np.rint(covered / np.maximum(totals, 1e-9) * 100).astype(np.int64).tolist()
+    return [score if total > 0 else None for score, total in zip(scores, totals.tolist())]
@@ -0,0 +1,175 @@
+# backend/pdf_renderer.py
+# Resume PDF rendering. Font lookup, font registration and the HTML/CSS wrapper are
+# prepared once per process by ResumeRenderer and reused for every render.
+# render_in_worker runs inside a PDF worker process, so everything here has to be
+# importable and picklable without the Flask app.
+import hashlib
+import os
+import time
+from functools import partial
+
+import markdown
+from reportlab.lib.fonts import addMapping
+from reportlab.pdfbase import pdfmetrics
+from reportlab.pdfbase.ttfonts import TTFont
+from xhtml2pdf import default as pisa_default
+from xhtml2pdf import pisa
+
+PDF_FILENAME_PREFIX = 'resume_'
+FONT_NAME = "NotoSansSC"
+FONT_FILENAME = "NotoSansSC-Regular.ttf"
+FALLBACK_FONT_FAMILY_CSS = "font-family: \"SimHei\", sans-serif;" # Fallback to SimHei
+
+RESUME_CSS_TEMPLATE = """
+            body {{ {font_family_css} line-height: 1.6; }}
+            h1 {{ font-size: 22pt; border-bottom: 2px solid #333; padding-bottom: 4px; margin-bottom: 0.8em; }}
+            h2 {{ font-size: 18pt; border-bottom: 1px solid #ccc; padding-bottom: 2px; margin-top: 1.5em; margin-bottom: 0.5em; }}
+            h3 {{ font-size: 14pt; margin-top: 1.2em; margin-bottom: 0.4em; }}
+            ul {{ list-style-type: disc; padding-left: 20px; margin-bottom: 1em; }}
+            li {{ margin-bottom: 0.5em; }}
+            strong {{ font-weight: bold; }}
+            p {{ margin-bottom: 1em; }}
+    """
+
+RESUME_HTML_TEMPLATE = """
+    <!DOCTYPE html>
+    <html>
+    <head>
+        <meta charset="UTF-8">
+        <style>{css}</style>
+    </head>
+    <body>
+        {body}
+    </body>
+    </html>
+    """
+
+_registered_fonts = set()
+
+
+def register_font(font_name, font_filepath):
+    # Parse the TTF once and make it known to reportlab and xhtml2pdf, so documents
+    # can use it by family name without an @font-face rule re-embedding it per render
+    if font_name in _registered_fonts:
+        return
+    pdfmetrics.registerFont(TTFont(font_name, font_filepath))
+    # The font has a single face; use it for bold/italic too rather than falling
+    # back to Helvetica-Bold, which has no CJK glyphs
+    for is_bold in (0, 1):
+        for is_italic in (0, 1):
+            addMapping(font_name, is_bold, is_italic, font_name)
+    pisa_default.DEFAULT_FONT[font_name.lower()] = font_name
+    _registered_fonts.add(font_name)
+
+
+class ResumeRenderer:
+    def __init__(self, static_folder, register_fonts=True):
+        self.static_folder = static_folder
+        self.temp_folder = os.path.join(static_folder, 'temp')
+        self.font_folder = os.path.join(static_folder, 'fonts')
+        os.makedirs(self.temp_folder, exist_ok=True)
+        os.makedirs(self.font_folder, exist_ok=True)
+
+        self.font_filepath = os.path.join(self.font_folder, FONT_FILENAME)
+        self.font_available = os.path.exists(self.font_filepath)
+        if self.font_available:
+            if register_fonts:
+                register_font(FONT_NAME, self.font_filepath)
+            font_family_css = f"font-family: '{FONT_NAME}', sans-serif;"
+        else:
+            font_family_css = FALLBACK_FONT_FAMILY_CSS
+
+        self.css = RESUME_CSS_TEMPLATE.format(font_family_css=font_family_css)
+        # Split the page template around the body once instead of formatting it per render
+        self._html_head, self._html_tail = RESUME_HTML_TEMPLATE.format(css=self.css, body='\0').split('\0')
+        self._markdown = markdown.Markdown()
+        self._link_callback = partial(_link_callback, static_folder)
+
+    def describe_font(self):
+        if self.font_available:
+            return f"Font '{FONT_NAME}' will be used from {self.font_filepath}"
+        return f"Font file not found at {self.font_filepath}. Falling back to system font."
+
+    def output_filename(self, resume_md):
+        # Identical markdown + stylesheet always maps to the same file on disk
+        digest = hashlib.sha256((resume_md + '\0' + self.css).encode('utf-8')).hexdigest()
+        return f"{PDF_FILENAME_PREFIX}{digest[:32]}.pdf"
+
+    def build_html(self, resume_md):
+        html_content = self._markdown.reset().convert(resume_md)
+        return self._html_head + html_content + self._html_tail
+
+    def render(self, resume_md, output_filepath):
+        html = self.build_html(resume_md)
+
+        # Write to a private temp file and rename it into place, so a concurrent
+        # request never serves a half-written PDF
+        temp_filepath = f"{output_filepath}.{os.getpid()}.tmp"
+        with open(temp_filepath, "w+b") as pdf_file:
+            pisa_status = pisa.CreatePDF(
+                src=html,
+                dest=pdf_file,
+                link_callback=self._link_callback
+            )
+        if pisa_status.err:
+            os.remove(temp_filepath)
+            return False
+        os.replace(temp_filepath, output_filepath)
+        return True
+
+
+def _link_callback(static_folder, uri, rel):
+    # Convert HTML URIs to absolute system paths so xhtml2pdf can access those resources
+    if uri.startswith("/static/"):
+        return os.path.join(static_folder, uri.replace("/static/", ""))
+    return uri # default
+
+
+# Renderer owned by a PDF worker process, set up by init_worker when the process starts
+_worker_renderer = None
+
+
+def init_worker(static_folder):
+    global _worker_renderer
+    _worker_renderer = ResumeRenderer(static_folder)
+
+
+def render_in_worker(resume_md, output_filepath):
+    return _worker_renderer.render(resume_md, output_filepath)
+
+
+def evict_stale_pdfs(folder, max_age_seconds, max_total_bytes):
+    # Remove rendered resumes older than max_age_seconds, then the least recently
+    # used ones until the folder fits in max_total_bytes
+    now = time.time()
+    entries = []
+    for entry in os.scandir(folder):
+        if not (entry.is_file() and entry.name.startswith(PDF_FILENAME_PREFIX) and entry.name.endswith('.pdf')):
+            continue
+        stat = entry.stat()
+        entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    removed = 0
+    kept = []
+    for mtime, size, path in entries:
+        if now - mtime > max_age_seconds:
+            removed += _remove_quietly(path)
+        else:
+            kept.append((mtime, size, path))
+
+    total_bytes = sum(size for _, size, _ in kept)
+    for mtime, size, path in sorted(kept):
+        if total_bytes <= max_total_bytes:
+            break
+        removed += _remove_quietly(path)
+        total_bytes -= size
+    return removed
+
+
+def _remove_quietly(path):
+    try:
+        os.remove(path)
+        return 1
+    except FileNotFoundError:
+        # Another worker evicted it first
+        return 0
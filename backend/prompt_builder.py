@@ -0,0 +1,205 @@
+# backend/prompt_builder.py
+# Prompt templates for the AI tasks, rendered to a token budget. Instructions and short
+# fields are always kept whole; long inputs (resume, JD) share whatever budget is left,
+# by weight, and are cut section by section so every markdown heading keeps its first
+# lines instead of the tail of the document being dropped wholesale.
+import re
+import threading
+from collections import OrderedDict
+
+from ai_backend import estimate_tokens
+
+TRUNCATION_MARKER = "…（内容过长，已截断）"
+_HEADING = re.compile(r'^#{1,6}\s')
+_HORIZONTAL_RULE = re.compile(r'^\s*([-*_])(\s*\1){2,}\s*$')
+
+
+def allocate_budget(sizes, weights, budget):
+    # Split budget across items in proportion to weights; items that need less than their
+    # share get exactly what they need and the rest is redistributed among the others
+    shares = [0] * len(sizes)
+    remaining = max(0, budget)
+    active = [index for index, size in enumerate(sizes) if size > 0]
+    while active:
+        total_weight = sum(weights[index] for index in active)
+        fitting = [index for index in active if sizes[index] <= remaining * weights[index] / total_weight]
+        if not fitting:
+            for index in active:
+                shares[index] = int(remaining * weights[index] / total_weight)
+            break
+        for index in fitting:
+            shares[index] = sizes[index]
+            remaining -= sizes[index]
+        active = [index for index in active if index not in fitting]
+    return shares
+
+
+def split_markdown_sections(text):
+    # Lists of lines, a new one starting at every heading
+    sections = [[]]
+    for line in text.splitlines():
+        if _HEADING.match(line) and sections[-1]:
+            sections.append([])
+        sections[-1].append(line)
+    return [section for section in sections if section]
+
+
+def _cut_line(line, budget):
+    if budget <= 0:
+        return ''
+    tokens = estimate_tokens(line)
+    if tokens <= budget:
+        return line
+    cut = line[:max(1, len(line) * budget // tokens)]
+    while cut and estimate_tokens(cut) > budget:
+        cut = cut[:-1]
+    return cut
+
+
+def _truncate_lines(lines, budget):
+    # Keep lines from the top of a section while they fit
+    kept = []
+    used = 0
+    for index, line in enumerate(lines):
+        tokens = estimate_tokens(line) + 1 # + the newline
+        if used + tokens > budget:
+            marker_tokens = estimate_tokens(TRUNCATION_MARKER)
+            cut = _cut_line(line, budget - used - marker_tokens - 1)
+            if cut.strip():
+                kept.append(cut + TRUNCATION_MARKER)
+            elif kept and used + marker_tokens <= budget:
+                kept.append(TRUNCATION_MARKER)
+            break
+        kept.append(line)
+        used += tokens
+    return kept
+
+
+def truncate_markdown(text, budget):
+    # Fit markdown into roughly `budget` tokens, giving each section a fair share
+    if not text or estimate_tokens(text) <= budget:
+        return text
+    sections = split_markdown_sections(text)
+    sizes = [sum(estimate_tokens(line) + 1 for line in section) for section in sections]
+    shares = allocate_budget(sizes, [1] * len(sections), budget)
+    kept_lines = []
+    for section, share in zip(sections, shares):
+        kept_lines.extend(_truncate_lines(section, share))
+    return '\n'.join(kept_lines)
+
+
+def build_resume_digest(profile_content, budget):
+    # Compact form of a resume for prompts: drop rules and blank-line runs, then truncate
+    lines = []
+    for line in (profile_content or '').splitlines():
+        line = line.rstrip()
+        if _HORIZONTAL_RULE.match(line):
+            continue
+        if not line and (not lines or not lines[-1]):
+            continue
+        lines.append(line)
+    return truncate_markdown('\n'.join(lines).strip(), budget)
+
+
+class DigestCache:
+    # Digests keyed by owner (e.g. user id). Each entry remembers the source text it was
+    # built from, so it is rebuilt only when that text, or the budget, changes.
+    def __init__(self, max_entries=1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict() # key -> (source_text, budget, digest)
+
+    def get(self, key, source_text, budget):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] == source_text and entry[1] == budget:
+                self._entries.move_to_end(key)
+                return entry[2]
+        return self.prime(key, source_text, budget)
+
+    def prime(self, key, source_text, budget):
+        digest = build_resume_digest(source_text, budget)
+        with self._lock:
+            self._entries[key] = (source_text, budget, digest)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return digest
+
+
+class PromptTemplate:
+    # `sections` are (title, name, weight): weight None means the value is always kept
+    # whole, otherwise values share the leftover budget in proportion to their weights
+    def __init__(self, instructions, sections):
+        self.instructions = instructions.strip()
+        self.sections = sections
+
+    def render(self, max_tokens, **values):
+        instructions = self.instructions.format(**values)
+        texts = {name: (values.get(name) or '无').strip() for _, name, _ in self.sections}
+
+        fixed_tokens = estimate_tokens(instructions)
+        flexible = []
+        for title, name, weight in self.sections:
+            fixed_tokens += estimate_tokens(f"--- {title} ---") + 2
+            if weight is None:
+                fixed_tokens += estimate_tokens(texts[name])
+            else:
+                flexible.append((name, weight))
+
+        shares = allocate_budget(
+            [estimate_tokens(texts[name]) for name, _ in flexible],
+            [weight for _, weight in flexible],
+            max_tokens - fixed_tokens
+        )
+        for (name, _), share in zip(flexible, shares):
+            texts[name] = truncate_markdown(texts[name], share)
+
+        parts = [instructions]
+        for title, name, _ in self.sections:
+            parts.append(f"--- {title} ---\n{texts[name]}")
+        return '\n\n'.join(parts)
+
+
+PRE_MATCH_PROMPT = PromptTemplate(
+    """
+请根据以下用户简历和岗位描述（JD），分析用户简历与该岗位的匹配度，并给出具体的简历优化建议。直接返回一段纯文本，不要使用JSON或Markdown格式。
+
+JD核心关键词: {keywords}
+""",
+    [('用户简历', 'resume', 1), ('岗位描述 (JD)', 'job_description', 1)]
+)
+
+QA_PROMPT = PromptTemplate(
+    """
+请根据以下用户简历和岗位描述（JD），为用户生成5个高频面试问题及对应的建议答案，确保问题类型多样化，覆盖技术、项目、行为等多个方面。
+
+以JSON Lines格式返回：每行一个JSON对象，包含 `question` 和 `suggested_answer` 两个键，不要输出其他内容。
+""",
+    [('用户简历', 'resume', 1), ('岗位描述 (JD)', 'job_description', 1)]
+)
+
+RESUME_PROMPT = PromptTemplate(
+    """
+请根据以下用户简历、岗位描述（JD）和用户指定的关键词，为该用户生成一份高度匹配该岗位的定制化简历，并以Markdown格式返回。
+
+- **核心要求**: 突出用户技能和经历与JD的契合点。
+- **关键词**: 在简历中巧妙地融入以下关键词: {keywords}
+""",
+    # The resume is the material being rewritten, so it gets the larger share
+    [('目标岗位', 'position', None), ('用户简历', 'resume', 2), ('岗位描述 (JD)', 'job_description', 1)]
+)
+
+SESSION_EVALUATION_PROMPT = PromptTemplate(
+    """
+你是一名资深面试官。请根据以下岗位信息和用户在模拟面试中的全部回答，一次性完成整场面试的评估，并以JSON格式返回结果。
+
+返回的JSON需要包含以下键：
+1. `overall_score`: 0-100 的整数，整场面试的综合得分。
+2. `report_summary`: 一段字符串，总结整场面试的表现和改进建议。
+3. `radar_chart_data`: 一个对象，键为 沟通能力、技术深度、逻辑思维、解决问题能力、学习潜力，值为 0-100 的整数。
+4. `feedback`: 一个对象数组，每个对象包含 `answer_id` 和 `feedback` 两个键，对每个回答给出具体反馈。
+""",
+    # Every answer has to be evaluated, so only the JD is cut to fit
+    [('目标岗位', 'position', None), ('岗位描述 (JD)', 'job_description', 1), ('面试回答', 'answers', None)]
+)
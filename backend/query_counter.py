@@ -0,0 +1,41 @@
+# backend/query_counter.py
+# Counts the SQL statements an engine executes, so a check (bench_session_queries.py) can
+# verify that an endpoint runs a fixed number of queries no matter how many rows it serializes.
+#
+#   with app.app_context(), assert_query_count(db.engine, 3):
+#       client.get(f'/opportunity/{opportunity_id}/interview_sessions')
+from contextlib import contextmanager
+
+from sqlalchemy import event
+
+
+class QueryCounter:
+    def __init__(self):
+        self.statements = []
+
+    @property
+    def count(self):
+        return len(self.statements)
+
+
+@contextmanager
+def count_queries(engine):
+    counter = QueryCounter()
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        counter.statements.append(statement)
+
+    event.listen(engine, 'before_cursor_execute', _before_cursor_execute)
+    try:
+        yield counter
+    finally:
+        event.remove(engine, 'before_cursor_execute', _before_cursor_execute)
+
+
+@contextmanager
+def assert_query_count(engine, expected):
+    with count_queries(engine) as counter:
+        yield counter
+    if counter.count != expected:
+        statements = "\n".join(counter.statements)
+        raise AssertionError(f"Expected {expected} queries, got {counter.count}:\n{statements}")
@@ -0,0 +1,99 @@
+# backend/search_index.py
+# Helpers for the SQLite FTS5 index over opportunities. FTS5's unicode61 tokenizer keeps a
+# run of CJK characters, and any letters touching it, together as one token, so indexed
+# text gets a zero-width space around every CJK character: each becomes a token of its
+# own and a Chinese query is matched as a phrase of consecutive characters. The separator
+# is invisible and is stripped from snippets, so what users see reads like the original.
+import re
+
+TABLE = 'opportunity_fts'
+COLUMNS = ('position_name', 'company_name', 'job_description', 'generated_resume_md')
+# bm25() weights in COLUMNS order: a hit in the position name counts the most
+COLUMN_WEIGHTS = (10.0, 5.0, 1.0, 0.5)
+
+CREATE_TABLE = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {TABLE} USING fts5("
+    f"{', '.join(COLUMNS)}, user_id UNINDEXED, tokenize='unicode61 remove_diacritics 2')"
+)
+
+HIGHLIGHT_START = '\x02'
+HIGHLIGHT_END = '\x03'
+ELLIPSIS = '…'
+
+_SEPARATOR = '\u200b' # zero-width space
+_CJK = '\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff' # kana, CJK ideographs, hangul
+# Before and after every CJK character, unless the neighbour is punctuation or space anyway
+_AROUND_CJK = re.compile(f'(?<=[{_CJK}])(?=\\w)|(?<=\\w)(?=[{_CJK}])')
+_RESERVED = re.compile(f'[{_SEPARATOR}{HIGHLIGHT_START}{HIGHLIGHT_END}]')
+_MARKERS = re.compile(f'[{HIGHLIGHT_START}{HIGHLIGHT_END}]')
+
+
+def segment(text):
+    # Text as stored in the index: CJK characters set apart, marker characters removed
+    if not text:
+        return ''
+    return _AROUND_CJK.sub(_SEPARATOR, _RESERVED.sub('', text))
+
+
+def index_values(values):
+    # FTS row parameters for an opportunity (dict with id, user_id and the COLUMNS)
+    row = {column: segment(values.get(column)) for column in COLUMNS}
+    row['rowid'] = values['id']
+    row['user_id'] = values['user_id']
+    return row
+
+
+def match_query(query):
+    # FTS5 MATCH expression for free user input: every whitespace-separated term is quoted
+    # as a phrase (so operators and quotes in the input are plain text) and all terms must
+    # match; the last one is a prefix, so results keep up with search-as-you-type
+    phrases = []
+    for term in query.split():
+        term = segment(term)
+        if not re.search(r'\w', term):
+            continue
+        phrases.append('"' + term.replace('"', '""') + '"')
+    if not phrases:
+        return None
+    phrases[-1] += '*'
+    return ' '.join(phrases)
+
+
+def snippet_segments(snippet):
+    # Highlighted snippet -> [{'text': ..., 'match': bool}], for clients to style matches
+    segments = []
+    for index, part in enumerate(_MARKERS.split(snippet or '')):
+        part = part.replace(_SEPARATOR, '')
+        if part:
+            segments.append({'text': part, 'match': index % 2 == 1})
+    return segments
+
+
+def plain_snippet(text, terms, width=32):
+    # Snippet without FTS5 (other databases): a window around the first hit, hits marked
+    text = text or ''
+    lowered = text.lower()
+    hits = sorted(
+        (position, position + len(term))
+        for term in {term.lower() for term in terms if term}
+        for position in [match.start() for match in re.finditer(re.escape(term), lowered)]
+    )
+    if not hits:
+        return [{'text': text[:width] + (ELLIPSIS if len(text) > width else ''), 'match': False}] if text else []
+
+    start = max(0, hits[0][0] - width // 4)
+    end = min(len(text), start + width)
+    segments = [{'text': ELLIPSIS, 'match': False}] if start else []
+    position = start
+    for hit_start, hit_end in hits:
+        if hit_start < position or hit_start >= end:
+            continue
+        if hit_start > position:
+            segments.append({'text': text[position:hit_start], 'match': False})
+        segments.append({'text': text[hit_start:min(hit_end, end)], 'match': True})
+        position = min(hit_end, end)
+    if position < end:
+        segments.append({'text': text[position:end], 'match': False})
+    if end < len(text):
+        segments.append({'text': ELLIPSIS, 'match': False})
+    return segments
@@ -0,0 +1,79 @@
+# backend/single_flight.py
+# Single-flight execution for streamed generations. The first request for a key starts
+# one producer on an executor; every request for the same key while it runs, the first
+# included, follows that producer and receives everything it publishes from the start.
+# A follower that disconnects only stops following, the producer still finishes.
+import threading
+
+
+class Flight:
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._items = []
+        self._closed = False
+        self.error = None
+
+    def publish(self, item):
+        with self._condition:
+            self._items.append(item)
+            self._condition.notify_all()
+
+    def close(self, error=None):
+        with self._condition:
+            self._closed = True
+            self.error = error
+            self._condition.notify_all()
+
+    def follow(self, timeout=None):
+        # Yield every published item in order, waiting for new ones until the flight closes;
+        # re-raise the producer's exception, if any, once everything has been replayed
+        index = 0
+        while True:
+            with self._condition:
+                if not self._condition.wait_for(lambda: index < len(self._items) or self._closed, timeout):
+                    raise TimeoutError('Timed out waiting for the generation')
+                items = self._items[index:]
+                closed = self._closed
+            for item in items:
+                yield item
+            index += len(items)
+            if closed and not items:
+                break
+        if self.error is not None:
+            raise self.error
+
+
+class SingleFlight:
+    def __init__(self, executor):
+        self._executor = executor
+        self._lock = threading.Lock()
+        self._flights = {}
+
+    def start(self, key, producer, *args):
+        # Return (flight, started); producer(flight, *args) runs only if no flight for key is in progress
+        with self._lock:
+            flight = self._flights.get(key)
+            if flight is not None:
+                return flight, False
+            flight = Flight()
+            self._flights[key] = flight
+            # Submit while holding the lock so a concurrent start() cannot race the registration
+            self._executor.submit(self._run, key, flight, producer, *args)
+        return flight, True
+
+    def _run(self, key, flight, producer, *args):
+        error = None
+        try:
+            producer(flight, *args)
+        except Exception as e:
+            error = e
+        finally:
+            # Close before forgetting the key, so a late follower still gets the full replay
+            flight.close(error)
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+
+    def in_flight(self):
+        with self._lock:
+            return len(self._flights)
@@ -0,0 +1,80 @@
+# backend/test_ai_backend.py
+# HTTPAIBackend against a local server replaying canned event streams: well-formed events
+# are assembled into text and usage, and anything else fails the call with AIBackendError
+# instead of an AttributeError or TypeError from deep inside the parser.
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from ai_backend import AIBackendError, HTTPAIBackend
+
+
+def _event(payload):
+    return 'data: ' + (payload if isinstance(payload, str) else json.dumps(payload)) + '\n\n'
+
+
+def _delta(text):
+    return {'choices': [{'index': 0, 'delta': {'content': text}}], 'usage': None}
+
+
+@pytest.fixture(scope='module')
+def provider():
+    # provider(events) -> an HTTPAIBackend whose next responses stream those events
+    streams = {}
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_POST(self):
+            self.rfile.read(int(self.headers['Content-Length']))
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/event-stream')
+            self.end_headers()
+            self.wfile.write(''.join(streams['events']).encode('utf-8'))
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def make(events):
+        streams['events'] = [_event(event) for event in events]
+        return HTTPAIBackend(f'http://127.0.0.1:{server.server_port}', 'key', 'model', read_timeout=2, max_tries=1)
+
+    yield make
+    server.shutdown()
+
+
+def test_stream_text_and_usage(provider):
+    backend = provider([
+        _delta('你好'), _delta('，世界'), {'choices': [{'index': 0, 'delta': {}}], 'usage': None},
+        {'choices': [], 'usage': {'prompt_tokens': 12, 'completion_tokens': 3}}, '[DONE]'
+    ])
+    usage = {}
+
+    assert backend.complete('test', 'prompt', usage=usage) == '你好，世界'
+    assert usage == {'prompt_tokens': 12, 'completion_tokens': 3}
+
+
+@pytest.mark.parametrize('event', [
+    '{oops',
+    '[1, 2]',
+    {'choices': [], 'usage': 'twelve tokens'},
+    {'choices': [], 'usage': [12, 3]},
+    {'choices': 'hello'},
+    {'choices': ['hello']},
+    {'choices': [None]},
+    {'choices': [{'delta': 'hello'}]},
+    {'choices': [{'delta': {'content': 42}}]},
+], ids=[
+    'bad-json', 'not-an-object', 'usage-string', 'usage-list', 'choices-string', 'choice-string',
+    'choice-null', 'delta-string', 'content-number'
+])
+def test_malformed_event_raises_backend_error(provider, event):
+    backend = provider([_delta('partial '), event, _delta('never reached'), '[DONE]'])
+
+    with pytest.raises(AIBackendError, match='malformed stream event'):
+        backend.complete('test', 'prompt')
+    assert backend.stats()['failures'] == 1
+    assert backend.stats()['in_flight'] == 0
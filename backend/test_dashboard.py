@@ -0,0 +1,46 @@
+# backend/test_dashboard.py
+# The dashboard cache is a bounded LRU: it serves repeat requests, forgets a user as soon
+# as their data changes, and keeps only the most recently used users.
+import pytest
+
+from app import _dashboard_cache, app
+
+
+@pytest.fixture
+def dashboard_users(client, monkeypatch):
+    monkeypatch.setitem(app.config, 'DASHBOARD_CACHE_MAX_ENTRIES', 2)
+    _dashboard_cache.clear()
+    openids = ['test_user_001']
+    for openid in ('dashboard_user_a', 'dashboard_user_b'):
+        client.post('/users', json={'openid': openid})
+        openids.append(openid)
+    return openids
+
+
+def _cached_user_ids():
+    return list(_dashboard_cache)
+
+
+def test_cache_keeps_only_most_recently_used_users(client, dashboard_users):
+    first, second, third = dashboard_users
+    for openid in (first, second):
+        assert client.get(f'/dashboard/{openid}').status_code == 200
+    first_id, second_id = _cached_user_ids()
+
+    client.get(f'/dashboard/{first}') # Hit: first becomes the most recently used
+    client.get(f'/dashboard/{third}')
+
+    assert len(_dashboard_cache) == 2
+    assert first_id in _cached_user_ids()
+    assert second_id not in _cached_user_ids()
+
+
+def test_writing_an_opportunity_drops_the_users_entry(client, dashboard_users):
+    before = client.get('/dashboard/test_user_001').get_json()
+    assert _cached_user_ids()
+
+    client.put('/opportunity/1', json={'status': '已结束'})
+
+    assert _cached_user_ids() == []
+    after = client.get('/dashboard/test_user_001').get_json()
+    assert after['status_counts'] != before['status_counts']
@@ -0,0 +1,58 @@
+# backend/test_generated_qa.py
+# An empty or unparseable generation must fail without touching what is stored (questions,
+# resume) and without being cached.
+import pytest
+
+from app import ai_backend, generation_cache
+
+
+def _questions(client, opportunity_id):
+    return [item['question'] for item in client.get(f'/opportunity/{opportunity_id}/questions').get_json()]
+
+
+@pytest.fixture
+def opportunity_with_questions(client, wait_for_job):
+    response = client.post('/opportunity/1/generate_qa')
+    assert wait_for_job(response.get_json()['id'])['status'] == 'succeeded'
+    questions = _questions(client, 1)
+    assert questions
+    generation_cache.clear()
+    return 1, questions
+
+
+@pytest.fixture(params=['', 'Sorry, I cannot help with that.\n[1, 2]\n{"answer": "no question"}'])
+def unusable_model(request, monkeypatch):
+    monkeypatch.setattr(ai_backend, '_open_stream', lambda task, prompt, context, usage: iter([request.param]))
+
+
+def test_empty_generation_job_fails_and_keeps_questions(client, wait_for_job, opportunity_with_questions, unusable_model):
+    opportunity_id, questions = opportunity_with_questions
+
+    job = wait_for_job(client.post(f'/opportunity/{opportunity_id}/generate_qa').get_json()['id'])
+
+    assert job['status'] == 'failed'
+    assert 'no usable' in job['error']
+    assert _questions(client, opportunity_id) == questions
+    assert generation_cache.stats()['disk_entries'] == 0
+
+
+def test_empty_generation_stream_errors_and_keeps_questions(client, opportunity_with_questions, unusable_model):
+    opportunity_id, questions = opportunity_with_questions
+
+    body = client.post(f'/opportunity/{opportunity_id}/generate_qa/stream').get_data(as_text=True)
+
+    assert 'event: error' in body
+    assert 'event: done' not in body
+    assert _questions(client, opportunity_id) == questions
+    assert generation_cache.stats()['disk_entries'] == 0
+
+
+def test_blank_resume_generation_fails_and_keeps_resume(client, wait_for_job, monkeypatch):
+    client.put('/opportunity/1/update_resume_content', json={'resume_md': '# Saved resume'})
+    monkeypatch.setattr(ai_backend, '_open_stream', lambda task, prompt, context, usage: iter(['  \n']))
+
+    job = wait_for_job(client.post('/opportunity/1/generate_resume', json={'keywords': ''}).get_json()['id'])
+
+    assert job['status'] == 'failed'
+    assert client.get('/opportunity/1').get_json()['generated_resume_md'] == '# Saved resume'
+    assert generation_cache.stats()['disk_entries'] == 0
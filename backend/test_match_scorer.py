@@ -0,0 +1,56 @@
+# backend/test_match_scorer.py
+# VectorCache memory stays bounded: entries of deleted or edited opportunities are dropped,
+# and the vocabulary is rebuilt from the live entries once it outgrows its limit.
+from keyword_extractor import SKILL_TERMS
+from match_scorer import VectorCache
+
+SKILLS = sorted(SKILL_TERMS)
+
+
+def _terms_of(cache, vector):
+    return sorted(cache.terms(vector[0]))
+
+
+def test_vocabulary_stays_bounded_while_texts_churn():
+    cache = VectorCache(max_entries=2, max_vocabulary=6)
+    kept = cache.put('kept', 1, 'Python Redis Docker')
+    kept_terms = _terms_of(cache, kept)
+    for version in range(20):
+        cache.put('churn', version, ' '.join(SKILLS[3 * version:3 * version + 3]))
+        # Rebuilt past twice the (at most 6) live terms, so never more than 12 + one text's 3
+        assert cache.vocabulary_size() <= 15
+
+    assert cache.stats()['vocabulary_rebuilds'] >= 3
+    assert _terms_of(cache, cache.get('kept', 1)) == kept_terms == ['docker', 'python', 'redis']
+    assert _terms_of(cache, cache.get('churn', 19)) == sorted(term.lower() for term in SKILLS[57:60])
+
+
+def test_rebuild_moves_generation_and_reuse_survives_it():
+    cache = VectorCache(max_entries=10, max_vocabulary=3)
+    cache.put('a', 1, 'Python Redis')
+    generation = cache.generation
+    cache.put('b', 1, 'Java Spring MySQL')
+    cache.discard(['b'])
+    cache.put('c', 1, 'Go Kafka')
+
+    assert cache.generation > generation
+    reused = cache.put('a', 2, 'Python Redis')
+    assert cache.stats()['reused'] == 1
+    assert _terms_of(cache, reused) == ['python', 'redis']
+
+
+def test_deleting_or_editing_an_opportunity_discards_its_vector(client):
+    from app import match_vectors
+
+    client.get('/opportunities/test_user_001/match_scores')
+    cached = {key for key in match_vectors._entries if key[0] == 'opportunity'}
+    assert {('opportunity', 1), ('opportunity', 2)} <= cached
+
+    client.delete('/opportunity/1')
+    client.put('/opportunity/2', json={'job_description': '负责Go微服务开发。'})
+    client.put('/opportunity/3', json={'status': '已结束'})
+
+    cached = {key for key in match_vectors._entries if key[0] == 'opportunity'}
+    assert ('opportunity', 1) not in cached
+    assert ('opportunity', 2) not in cached
+    assert ('opportunity', 3) in cached
@@ -0,0 +1,40 @@
+# backend/test_session_evaluation.py
+# Batch evaluation of an interview session runs as a background job; the session picks
+# up the score and per-answer feedback once the job succeeds.
+
+
+def _answered_session(client, opportunity_id=1):
+    session = client.post(f'/opportunity/{opportunity_id}/interview_sessions').get_json()
+    answers = session['session_answers']
+    for answer in answers[:2]:
+        response = client.put(
+            f"/interview_session/{session['id']}/answers/{answer['id']}",
+            json={'user_answer_transcript': '我会先分析瓶颈再做优化。', 'defer_feedback': True}
+        )
+        assert response.status_code == 200
+    return session['id'], [answer['id'] for answer in answers[:2]]
+
+
+def test_batch_finish_returns_job_and_job_fills_in_feedback(client, wait_for_job):
+    session_id, answer_ids = _answered_session(client)
+
+    response = client.put(f'/interview_session/{session_id}/finish', json={'mode': 'batch'})
+
+    assert response.status_code == 202
+    assert response.headers['Location'] == f"/jobs/{response.get_json()['id']}"
+    job = wait_for_job(response.get_json()['id'])
+    assert job['status'] == 'succeeded'
+    session = client.get(f'/interview_session/{session_id}').get_json()
+    assert session['evaluation_mode'] == 'batch'
+    assert session['overall_score'] is not None
+    feedback = {answer['id']: answer['ai_feedback'] for answer in session['session_answers']}
+    assert all(feedback[answer_id] for answer_id in answer_ids)
+    assert job['result']['id'] == session_id
+
+
+def test_batch_finish_without_answers_is_rejected(client):
+    session = client.post('/opportunity/1/interview_sessions').get_json()
+
+    response = client.put(f"/interview_session/{session['id']}/finish", json={'mode': 'batch'})
+
+    assert response.status_code == 400
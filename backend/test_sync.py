@@ -0,0 +1,49 @@
+# backend/test_sync.py
+# /sync?since= accepts its own naive UTC cursors as well as ISO 8601 timestamps with an
+# offset or a trailing Z, and rejects anything else with a 400.
+import time
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+OPENID = 'test_user_001'
+
+
+def _sync(client, since):
+    return client.get(f'/sync/{OPENID}', query_string={'since': since})
+
+
+def _position_names(response):
+    return [opportunity['position_name'] for opportunity in response.get_json()['opportunities']]
+
+
+@pytest.fixture
+def cursor_before_edit(client):
+    # Naive UTC instant between seeding the data and editing one opportunity
+    time.sleep(0.01)
+    cursor = datetime.utcnow()
+    time.sleep(0.01)
+    client.put('/opportunity/1', json={'position_name': '高级前端开发工程师'})
+    return cursor
+
+
+@pytest.mark.parametrize('to_param', [
+    lambda cursor: cursor.isoformat(),
+    lambda cursor: cursor.isoformat() + 'Z',
+    lambda cursor: cursor.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=8))).isoformat(),
+    lambda cursor: cursor.replace(tzinfo=timezone.utc).astimezone(timezone(timedelta(hours=-5))).isoformat(),
+], ids=['naive', 'z-suffix', 'plus-0800', 'minus-0500'])
+def test_since_with_any_utc_offset_returns_only_changes(client, cursor_before_edit, to_param):
+    response = _sync(client, to_param(cursor_before_edit))
+
+    assert response.status_code == 200
+    assert response.get_json()['full'] is False
+    assert _position_names(response) == ['高级前端开发工程师']
+
+
+@pytest.mark.parametrize('since', ['yesterday', '2024-13-01T00:00:00', '2024-01-01T00:00:00+25:00', 'Z'])
+def test_unparseable_since_is_rejected(client, since):
+    response = _sync(client, since)
+
+    assert response.status_code == 400
+    assert 'since' in response.get_json()['error']
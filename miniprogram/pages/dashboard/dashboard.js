@@ -16,8 +16,7 @@ Page({
   },
 
   onLoad: function (options) {
-    this.fetchAbilityData();
-    this.fetchActionSuggestions(); // 调用API获取行动建议
+    this.fetchDashboardData(); // 一次请求获取能力数据和行动建议
     console.log('onLoad end - errorAbilityData:', this.data.errorAbilityData);
   },
 
@@ -40,8 +39,7 @@ Page({
   },
 
   onPullDownRefresh: function () {
-    this.fetchAbilityData();
-    this.fetchActionSuggestions(); // 下拉刷新时重新获取行动建议
+    this.fetchDashboardData(); // 下拉刷新时重新获取能力数据和行动建议
   },
   onReachBottom: function () {
 
@@ -61,172 +59,84 @@ Page({
     }));
   },
 
-  // 从后端API获取能力数据
-  fetchAbilityData: function () {
-    const app = getApp();
-    const backendBaseUrl = app.globalData.backendBaseUrl;
-    const userOpenId = app.globalData.userInfo ? app.globalData.userInfo.openid : null;
-
-    console.log('Fetching ability data...');
-    console.log('backendBaseUrl:', backendBaseUrl);
-    console.log('userOpenId:', userOpenId);
-
-    if (!backendBaseUrl) {
-      console.error('backendBaseUrl is not configured in app.js globalData.');
-      this.setData({
-        errorAbilityData: true,
-        loadingAbilityData: false,
-        combinedAbilityData: []
-      });
-      console.log('fetchAbilityData end (no backendBaseUrl) - errorAbilityData:', this.data.errorAbilityData);
-      return;
-    }
+  // 将最近两次评估的雷达数据合并为能力对比数据
+  _buildCombinedAbilityData: function (latest_assessment, previous_assessment) {
+    const fetchedLatestData = (latest_assessment && latest_assessment.radar_chart_data) ? this._convertObjectToArray(latest_assessment.radar_chart_data) : [];
+    const fetchedPreviousData = (previous_assessment && previous_assessment.radar_chart_data) ? this._convertObjectToArray(previous_assessment.radar_chart_data) : [];
 
-    if (!userOpenId) {
-      console.error('User OpenID not found in globalData.userInfo.');
-      this.setData({
-        errorAbilityData: true,
-        loadingAbilityData: false,
-        combinedAbilityData: []
-      });
-      console.log('fetchAbilityData end (no userOpenId) - errorAbilityData:', this.data.errorAbilityData);
-      return;
-    }
+    return fetchedLatestData.map((item, index) => ({
+      key: item.key,
+      latest_value: item.value,
+      previous_value: fetchedPreviousData[index] ? fetchedPreviousData[index].value : 0
+    }));
+  },
 
+  _setDashboardError: function () {
     this.setData({
-      loadingAbilityData: true,
-      errorAbilityData: false,
-      combinedAbilityData: []
-    });
-
-    wx.request({
-      url: `${backendBaseUrl}/assessments/latest/${userOpenId}`,
-      method: 'GET',
-      success: (res) => {
-        console.log('API Response Status Code:', res.statusCode);
-        console.log('API Response Data:', res.data);
-
-        if (res.statusCode === 200 && res.data) {
-          console.log('API call successful, processing data.');
-          const { latest_assessment, previous_assessment } = res.data;
-
-          console.log('Raw latest_assessment.radar_chart_data:', latest_assessment ? latest_assessment.radar_chart_data : 'N/A');
-          console.log('Raw previous_assessment.radar_chart_data:', previous_assessment ? previous_assessment.radar_chart_data : 'N/A');
-
-          // 使用辅助函数转换数据
-          let fetchedLatestData = (latest_assessment && latest_assessment.radar_chart_data) ? this._convertObjectToArray(latest_assessment.radar_chart_data) : [];
-          let fetchedPreviousData = (previous_assessment && previous_assessment.radar_chart_data) ? this._convertObjectToArray(previous_assessment.radar_chart_data) : [];
-
-          console.log('Processed fetchedLatestData:', fetchedLatestData);
-          console.log('Processed fetchedPreviousData:', fetchedPreviousData);
-
-          const combined = fetchedLatestData.map((item, index) => ({
-            key: item.key,
-            latest_value: item.value,
-            previous_value: fetchedPreviousData[index] ? fetchedPreviousData[index].value : 0
-          }));
-
-          console.log('Before setData - loadingAbilityData:', this.data.loadingAbilityData, 'errorAbilityData:', this.data.errorAbilityData);
-          this.setData({
-            combinedAbilityData: combined,
-            loadingAbilityData: false,
-            errorAbilityData: false // 明确设置为 false
-          });
-          console.log('After setData - loadingAbilityData:', this.data.loadingAbilityData, 'errorAbilityData:', this.data.errorAbilityData);
-          console.log('Combined Ability Data Length:', combined.length);
-        } else {
-          console.log('API call returned non-200 status or empty data, setting error state.');
-          console.error('Failed to fetch ability data (non-200 or empty data):', res);
-          this.setData({
-            errorAbilityData: true,
-            loadingAbilityData: false,
-            combinedAbilityData: []
-          });
-        }
-        console.log('fetchAbilityData end (success callback) - errorAbilityData:', this.data.errorAbilityData);
-      },
-      fail: (err) => {
-        console.log('Request for ability data failed (network error), setting error state.');
-        console.error('Request for ability data failed (network error):', err);
-        this.setData({
-          errorAbilityData: true,
-          loadingAbilityData: false,
-          combinedAbilityData: []
-        });
-        console.log('fetchAbilityData end (fail callback) - errorAbilityData:', this.data.errorAbilityData);
-      }
+      errorAbilityData: true,
+      loadingAbilityData: false,
+      combinedAbilityData: [],
+      errorActionSuggestions: true,
+      loadingActionSuggestions: false,
+      actionSuggestions: []
     });
   },
 
-  // 从后端API获取行动建议数据
-  fetchActionSuggestions: function () {
+  // 从后端API一次获取能力数据和行动建议
+  fetchDashboardData: function () {
     const app = getApp();
     const backendBaseUrl = app.globalData.backendBaseUrl;
     const userOpenId = app.globalData.userInfo ? app.globalData.userInfo.openid : null;
 
-    console.log('Fetching action suggestions...');
-    console.log('backendBaseUrl (suggestions):', backendBaseUrl);
-    console.log('userOpenId (suggestions):', userOpenId);
+    console.log('Fetching dashboard data...');
 
     if (!backendBaseUrl) {
-      console.error('backendBaseUrl is not configured for action suggestions.');
-      this.setData({
-        errorActionSuggestions: true,
-        loadingActionSuggestions: false,
-        actionSuggestions: []
-      });
+      console.error('backendBaseUrl is not configured in app.js globalData.');
+      this._setDashboardError();
       return;
     }
 
     if (!userOpenId) {
-      console.error('User OpenID not found for action suggestions.');
-      this.setData({
-        errorActionSuggestions: true,
-        loadingActionSuggestions: false,
-        actionSuggestions: []
-      });
+      console.error('User OpenID not found in globalData.userInfo.');
+      this._setDashboardError();
       return;
     }
 
     this.setData({
+      loadingAbilityData: true,
+      errorAbilityData: false,
+      combinedAbilityData: [],
       loadingActionSuggestions: true,
       errorActionSuggestions: false,
       actionSuggestions: []
     });
 
     wx.request({
-      url: `${backendBaseUrl}/action_suggestions/${userOpenId}`,
+      url: `${backendBaseUrl}/dashboard/${userOpenId}`,
       method: 'GET',
       success: (res) => {
-        console.log('Action Suggestions API Response Status Code:', res.statusCode);
-        console.log('Action Suggestions API Response Data:', res.data);
+        console.log('Dashboard API Response Data:', res.data);
 
-        if (res.statusCode === 200 && Array.isArray(res.data)) {
-          console.log('Action Suggestions API call successful, processing data.');
+        if (res.statusCode === 200 && res.data) {
+          const { latest_assessment, previous_assessment, action_suggestions } = res.data;
           this.setData({
-            actionSuggestions: res.data,
+            combinedAbilityData: this._buildCombinedAbilityData(latest_assessment, previous_assessment),
+            loadingAbilityData: false,
+            errorAbilityData: false,
+            actionSuggestions: Array.isArray(action_suggestions) ? action_suggestions : [],
             loadingActionSuggestions: false,
             errorActionSuggestions: false
           });
         } else {
-          console.error('Failed to fetch action suggestions (non-200 or non-array data):', res);
-          this.setData({
-            errorActionSuggestions: true,
-            loadingActionSuggestions: false,
-            actionSuggestions: []
-          });
+          console.error('Failed to fetch dashboard data (non-200 or empty data):', res);
+          this._setDashboardError();
         }
-        console.log('fetchActionSuggestions end (success callback) - errorActionSuggestions:', this.data.errorActionSuggestions);
       },
       fail: (err) => {
-        console.error('Request for action suggestions failed (network error):', err);
-        this.setData({
-          errorActionSuggestions: true,
-          loadingActionSuggestions: false,
-          actionSuggestions: []
-        });
-        console.log('fetchActionSuggestions end (fail callback) - errorActionSuggestions:', this.data.errorActionSuggestions);
-      }
+        console.error('Request for dashboard data failed (network error):', err);
+        this._setDashboardError();
+      },
+      complete: () => { wx.stopPullDownRefresh(); }
     });
   },
 
@@ -1,5 +1,6 @@
 // pages/opportunities/opportunities.js
 const app = getApp();
+const { syncUserData } = require('../../utils/sync');
 
 Page({
   data: {
@@ -9,6 +10,7 @@ Page({
     statusOptions: ['待投递', '已投递', '面试中', '已发Offer', '已结束'],
     // Filter & Search State
     searchQuery: '',
+    searchResults: null, // Server search results for searchQuery; null while no search is active
     filterOptions: ['全部', '待投递', '已投递', '面试中', '已发Offer', '已结束'],
     activeFilterIndex: 0,
     externalFilterStatus: null, // 新增：用于存储从外部传入的过滤状态
@@ -59,13 +61,16 @@ Page({
       return;
     }
 
-    wx.request({
-      url: `${backendBaseUrl}/opportunities/${userOpenId}`,
-      method: 'GET',
-      success: (res) => {
-        if (res.statusCode === 200) {
-          const opportunities = res.data.map(opp => {
-            const statusIconMap = { '待投递': '✏️', '已投递': '✈️', '面试中': '🗓️', '已发Offer': '✅', '已结束': '❌' };
+    // Only changes since the last visit are downloaded; the list is built from the local copy.
+    // The cards only need these fields; JD and generated content are loaded on the detail page.
+    syncUserData(userOpenId, {
+      fields: 'id,position_name,company_name,status,latest_progress,created_at',
+      success: (state) => {
+        const statusIconMap = { '待投递': '✏️', '已投递': '✈️', '面试中': '🗓️', '已发Offer': '✅', '已结束': '❌' };
+        const opportunities = Object.keys(state.opportunities)
+          .map(id => Object.assign({}, state.opportunities[id]))
+          .sort((a, b) => a.id - b.id)
+          .map(opp => {
             const formattedCreateDate = opp.created_at.substring(0, 10);
             if (opp.latest_progress) {
               const icon = statusIconMap[opp.status] || '📢';
@@ -75,22 +80,79 @@ Page({
             }
             return opp;
           });
-          this.setData({ allOpportunities: opportunities });
-          console.log('All Opportunities after fetch:', this.data.allOpportunities);
-          this.applyFilters(initialFilterStatus); // 将初始过滤状态传递给 applyFilters
-        } else {
-          wx.showToast({ title: '获取列表失败', icon: 'error' });
-        }
+        this.setData({ allOpportunities: opportunities });
+        console.log('All Opportunities after fetch:', this.data.allOpportunities);
+        this.applyFilters(initialFilterStatus); // 将初始过滤状态传递给 applyFilters
+        this.fetchMatchScores(initialFilterStatus);
+      },
+      fail: (err) => {
+        wx.showToast({ title: err && err.statusCode ? '获取列表失败' : '网络错误', icon: 'error' });
       },
-      fail: () => { wx.showToast({ title: '网络错误', icon: 'error' }); },
       complete: () => { wx.stopPullDownRefresh(); }
     });
   },
 
+  // Resume/JD match scores are computed on the server for the whole list in one request
+  fetchMatchScores: function (initialFilterStatus = null) {
+    const userOpenId = app.globalData.userInfo ? app.globalData.userInfo.openid : null;
+    const backendBaseUrl = app.globalData.backendBaseUrl;
+
+    wx.request({
+      url: `${backendBaseUrl}/opportunities/${userOpenId}/match_scores`,
+      method: 'GET',
+      success: (res) => {
+        if (res.statusCode !== 200) {
+          return; // The list is still usable without scores
+        }
+        const scoreMap = {};
+        res.data.forEach(item => { scoreMap[item.opportunity_id] = item.score; });
+        const opportunities = this.data.allOpportunities.map(opp => {
+          const score = scoreMap[opp.id];
+          opp.matchScore = (score === undefined || score === null) ? null : score;
+          return opp;
+        });
+        this.setData({ allOpportunities: opportunities });
+        this.applyFilters(initialFilterStatus);
+      }
+    });
+  },
+
   // --- Filter & Search Logic --- //
   handleSearchInput: function(e) {
-    this.setData({ searchQuery: e.detail.value });
+    const query = e.detail.value;
+    this.setData({ searchQuery: query, searchResults: null });
     this.applyFilters();
+
+    // Search JD and resume content on the server once typing pauses
+    clearTimeout(this._searchTimer);
+    if (query.trim() !== '') {
+      this._searchTimer = setTimeout(() => this.searchOpportunities(query), 300);
+    }
+  },
+
+  searchOpportunities: function(query) {
+    const userOpenId = app.globalData.userInfo ? app.globalData.userInfo.openid : null;
+    const backendBaseUrl = app.globalData.backendBaseUrl;
+
+    wx.request({
+      url: `${backendBaseUrl}/opportunities/${userOpenId}/search`,
+      method: 'GET',
+      data: { q: query.trim() },
+      success: (res) => {
+        if (res.statusCode !== 200 || query !== this.data.searchQuery) {
+          return; // Keep the local filter; ignore responses for an outdated query
+        }
+        // Reuse the cards already loaded, adding the highlighted snippet of the match
+        const cardsById = {};
+        this.data.allOpportunities.forEach(opp => { cardsById[opp.id] = opp; });
+        const results = res.data.map(result => ({
+          ...(cardsById[result.id] || result),
+          snippet: result.snippet
+        }));
+        this.setData({ searchResults: results });
+        this.applyFilters();
+      }
+    });
   },
 
   handleFilterChange: function(e) {
@@ -101,7 +163,7 @@ Page({
   applyFilters: function(externalFilterStatus = null) {
     console.log('Applying filters...');
     console.log('applyFilters: externalFilterStatus parameter:', externalFilterStatus);
-    const { allOpportunities, activeFilterIndex, filterOptions, searchQuery } = this.data;
+    const { allOpportunities, searchResults, activeFilterIndex, filterOptions, searchQuery } = this.data;
     console.log('applyFilters: activeFilterIndex:', activeFilterIndex);
     console.log('applyFilters: filterOptions:', filterOptions);
     console.log('applyFilters: searchQuery:', searchQuery);
@@ -110,7 +172,7 @@ Page({
     let currentFilterStatus = externalFilterStatus || filterOptions[activeFilterIndex];
     console.log('Current Filter Status:', currentFilterStatus);
 
-    let filtered = allOpportunities;
+    let filtered = searchResults || allOpportunities;
     console.log('Opportunities before status filtering:', filtered);
 
     // Apply status filter
@@ -119,8 +181,8 @@ Page({
     }
     console.log('Opportunities after status filtering:', filtered);
 
-    // Apply search filter
-    if (searchQuery.trim() !== '') {
+    // Until the server search answers, filter the loaded cards by position and company
+    if (!searchResults && searchQuery.trim() !== '') {
       const lowerCaseQuery = searchQuery.toLowerCase();
       filtered = filtered.filter(opp => 
         opp.position_name.toLowerCase().includes(lowerCaseQuery) ||
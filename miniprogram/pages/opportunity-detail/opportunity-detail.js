@@ -1,6 +1,10 @@
 // pages/opportunity-detail/opportunity-detail.js
 const app = getApp();
 const Towxml = require('../../towxml/main');
+const { requestEventStream } = require('../../utils/sse');
+const { getWithETag } = require('../../utils/etag_request');
+const { textEdits, listPatch } = require('../../utils/document_patch');
+const { uploadAnswerAudio } = require('../../utils/audio_upload');
 
 // A simple debounce function
 let debounceTimer = null;
@@ -43,7 +47,34 @@ Page({
         actions: [
             { name: '下载PDF', value: 'download' }
         ],
-        userAnswerText: '' // New data property for text input
+        userAnswerText: '', // New data property for text input
+        isRecording: false,
+        recordedAudioPath: '', // Recording of the current answer, uploaded when the answer is submitted
+        recordedAudioSeconds: 0,
+        answerAudioUrl: '' // Where the uploaded recording of the current answer can be played from
+    },
+
+    // Poll a background AI job until it finishes
+    _pollJob(jobId, onSuccess, onFail, interval = 1000) {
+        const backendBaseUrl = app.globalData.backendBaseUrl;
+        wx.request({
+            url: `${backendBaseUrl}/jobs/${jobId}`,
+            method: 'GET',
+            success: (res) => {
+                if (res.statusCode !== 200) {
+                    onFail();
+                } else if (res.data.status === 'succeeded') {
+                    onSuccess(res.data.result);
+                } else if (res.data.status === 'failed') {
+                    onFail();
+                } else {
+                    setTimeout(() => this._pollJob(jobId, onSuccess, onFail, interval), interval);
+                }
+            },
+            fail: () => {
+                onFail();
+            }
+        });
     },
 
     // Helper to show toast messages
@@ -176,9 +207,8 @@ Page({
             'latestInterviewSession.radar_chart_data_array': []
         });
 
-        wx.request({
+        getWithETag({
             url: `http://127.0.0.1:5000/interview_session/${sessionId}`,
-            method: 'GET',
             success: (res) => {
                 if (res.statusCode === 200) {
                     const selectedSession = res.data;
@@ -235,6 +265,19 @@ Page({
     },
 
   onLoad: function (options) {
+    this.recorderManager = wx.getRecorderManager();
+    this.recorderManager.onStop((res) => {
+      this.setData({
+        isRecording: false,
+        recordedAudioPath: res.tempFilePath,
+        recordedAudioSeconds: Math.round(res.duration / 1000)
+      });
+    });
+    this.recorderManager.onError((err) => {
+      console.error('Recording failed:', err);
+      this.setData({ isRecording: false });
+      wx.showToast({ title: '录音失败', icon: 'error' });
+    });
     if (options.id) {
       this.setData({ opportunityId: options.id });
       this.fetchOpportunityDetail();
@@ -254,9 +297,9 @@ Page({
     if (!id) return;
 
     const backendBaseUrl = app.globalData.backendBaseUrl;
-    wx.request({
+    // Revalidated with the stored ETag: an unchanged opportunity costs a 304, not the whole body
+    getWithETag({
       url: `${backendBaseUrl}/opportunity/${id}`,
-      method: 'GET',
       success: (res) => {
         let generatedQA = []; // Declare generatedQA at the beginning of the success callback
         if (res.statusCode === 200) {
@@ -270,19 +313,10 @@ Page({
             resumeMarkdown = towxml.toJson(generatedResumeMd);
           }
 
-          const generatedQaJson = res.data.generated_qa_json || null;
-          let generatedQA = [];
-          if (generatedQaJson) {
-            try {
-              const parsedQa = JSON.parse(generatedQaJson);
-              generatedQA = parsedQa.map(item => ({
-                question_text: (item.question_text !== undefined ? item.question_text : item.question) || '',
-                suggested_answer: item.suggested_answer !== undefined ? item.suggested_answer : ''
-              }));
-            } catch (e) {
-              console.error("Error parsing generated_qa_json:", e);
-            }
-          }
+          const generatedQA = (res.data.question_items || []).map(item => ({
+            question_text: item.question || '',
+            suggested_answer: item.suggested_answer || ''
+          }));
 
           this.setData({ 
             opportunity: res.data,
@@ -332,6 +366,7 @@ Page({
     const id = this.data.opportunityId;
     const backendBaseUrl = app.globalData.backendBaseUrl;
 
+    // Keywords are extracted on the server without an AI call and come back immediately
     wx.request({
       url: `${backendBaseUrl}/opportunity/${id}/analyze_jd`,
       method: 'POST',
@@ -353,6 +388,44 @@ Page({
     });
   },
 
+  handleGeneratePreMatch: function() {
+    if (this.data.isGeneratingPreMatch) {
+      return;
+    }
+    this.setData({ isGeneratingPreMatch: true });
+
+    const id = this.data.opportunityId;
+    const backendBaseUrl = app.globalData.backendBaseUrl;
+
+    wx.request({
+      url: `${backendBaseUrl}/opportunity/${id}/analyze_jd`,
+      method: 'POST',
+      data: {
+        pre_match: true
+      },
+      success: (res) => {
+        if (res.statusCode === 202) {
+          this._pollJob(res.data.id, (result) => {
+            this.setData({
+              isGeneratingPreMatch: false,
+              jdAnalysisResult: result
+            });
+          }, () => {
+            this.setData({ isGeneratingPreMatch: false });
+            wx.showToast({ title: '分析失败', icon: 'error' });
+          });
+        } else {
+          this.setData({ isGeneratingPreMatch: false });
+          wx.showToast({ title: '分析失败', icon: 'error' });
+        }
+      },
+      fail: () => {
+        this.setData({ isGeneratingPreMatch: false });
+        wx.showToast({ title: '网络错误', icon: 'error' });
+      }
+    });
+  },
+
   // --- Keyword Modal and Resume Generation --- //
   showKeywordModal: function() {
     this.setData({ isKeywordModalVisible: true, resumeKeywords: '' });
@@ -389,36 +462,56 @@ Page({
   },
 
   _callGenerateResumeApi: function() {
+    if (this.data.isGeneratingResume) {
+      return; // Already generating; ignore repeated taps
+    }
     this.setData({ isGeneratingResume: true });
 
     const id = this.data.opportunityId;
     const backendBaseUrl = app.globalData.backendBaseUrl;
+    const towxml = new Towxml();
+    let resumeMd = '';
+    let finished = false;
 
-    wx.request({
-      url: `${backendBaseUrl}/opportunity/${id}/generate_resume`,
+    // Markdown is streamed in as it is generated and rendered chunk by chunk
+    requestEventStream({
+      url: `${backendBaseUrl}/opportunity/${id}/generate_resume/stream`,
       method: 'POST',
       data: {
         keywords: this.data.resumeKeywords
       },
-      success: (res) => {
-        if (res.statusCode === 200 && res.data.resume_md) {
-          const towxml = new Towxml();
-          const resumeMarkdown = towxml.toJson(res.data.resume_md);
+      onEvent: (event, data) => {
+        if (event === 'chunk') {
+          resumeMd += data.text;
           this.setData({
-            generatedResumeMd: res.data.resume_md,
-            resumeMarkdown: resumeMarkdown,
+            generatedResumeMd: resumeMd,
+            resumeMarkdown: towxml.toJson(resumeMd),
+            activeTab: 'resume'
+          });
+        } else if (event === 'done') {
+          finished = true;
+          this.setData({
+            generatedResumeMd: data.resume_md,
+            resumeMarkdown: towxml.toJson(data.resume_md),
             activeTab: 'resume',
-            'opportunity.generated_resume_md': res.data.resume_md // Update the opportunity object
+            isGeneratingResume: false,
+            'opportunity.generated_resume_md': data.resume_md // Update the opportunity object
           });
-        } else {
+        } else if (event === 'error') {
+          finished = true;
+          this.setData({ isGeneratingResume: false });
           wx.showToast({ title: '生成失败', icon: 'error' });
         }
       },
-      fail: () => {
-        wx.showToast({ title: '网络错误', icon: 'error' });
+      onComplete: () => {
+        if (!finished) {
+          this.setData({ isGeneratingResume: false });
+          wx.showToast({ title: '生成失败', icon: 'error' });
+        }
       },
-      complete: () => {
+      onError: () => {
         this.setData({ isGeneratingResume: false });
+        wx.showToast({ title: '网络错误', icon: 'error' });
       }
     });
   },
@@ -445,33 +538,52 @@ Page({
   },
 
   _callGenerateQaApi: function() {
+    if (this.data.isGeneratingQa) {
+      return; // Already generating; ignore repeated taps
+    }
     this.setData({ isGeneratingQa: true });
 
     const id = this.data.opportunityId;
     const backendBaseUrl = app.globalData.backendBaseUrl;
+    const qaList = [];
+    let finished = false;
 
-    wx.request({
-      url: `${backendBaseUrl}/opportunity/${id}/generate_qa`,
+    // Questions are streamed in one at a time and shown as soon as they arrive
+    requestEventStream({
+      url: `${backendBaseUrl}/opportunity/${id}/generate_qa/stream`,
       method: 'POST',
-      success: (res) => {
-        if (res.statusCode === 200 && res.data.qa_list) {
+      onEvent: (event, data) => {
+        if (event === 'qa') {
+          qaList.push({
+            question_text: (data.question_text !== undefined ? data.question_text : data.question) || '',
+            suggested_answer: data.suggested_answer !== undefined ? data.suggested_answer : ''
+          });
+          this.setData({
+            generatedQaList: qaList,
+            activeTab: 'qa'
+          });
+        } else if (event === 'done') {
+          finished = true;
           this.setData({
-            generatedQaList: res.data.qa_list.map(item => ({
-              question_text: (item.question_text !== undefined ? item.question_text : item.question) || '',
-              suggested_answer: item.suggested_answer !== undefined ? item.suggested_answer : ''
-            })),
             activeTab: 'qa',
-            'opportunity.generated_qa_json': JSON.stringify(res.data.qa_list) // Update the opportunity object
+            isGeneratingQa: false,
+            'opportunity.question_items': data.qa_list // Update the opportunity object
           });
-        } else {
+        } else if (event === 'error') {
+          finished = true;
+          this.setData({ isGeneratingQa: false });
           wx.showToast({ title: '生成问题失败', icon: 'error' });
         }
       },
-      fail: () => {
-        wx.showToast({ title: '网络错误', icon: 'error' });
+      onComplete: () => {
+        if (!finished) {
+          this.setData({ isGeneratingQa: false });
+          wx.showToast({ title: '生成问题失败', icon: 'error' });
+        }
       },
-      complete: () => {
+      onError: () => {
         this.setData({ isGeneratingQa: false });
+        wx.showToast({ title: '网络错误', icon: 'error' });
       }
     });
   },
@@ -494,6 +606,7 @@ Page({
           this.setData({
             currentInterviewSessionId: res.data.id, // Store the new session ID
             generatedQaList: res.data.session_answers.map(item => ({
+              answer_id: item.id, // Used to record the answer for this exact question
               question_text: (item.question_text !== undefined ? item.question_text : item.question) || '',
               suggested_answer: item.suggested_answer !== undefined ? item.suggested_answer : ''
             })), // Use questions from the new session
@@ -523,11 +636,51 @@ Page({
       this.setData({
         practiceState: 'initial',
         userAnswerText: '', // Clear previous answer
-        aiFeedback: ''
+        aiFeedback: '',
+        recordedAudioPath: '',
+        recordedAudioSeconds: 0,
+        answerAudioUrl: ''
       });
     }
   },
 
+  toggleRecording: function() {
+    if (this.data.isRecording) {
+      this.recorderManager.stop(); // onStop keeps the file for submitAnswer
+      return;
+    }
+    this.setData({ isRecording: true, recordedAudioPath: '', recordedAudioSeconds: 0 });
+    this.recorderManager.start({ format: 'mp3', duration: 600000 });
+  },
+
+  _uploadRecordedAnswer: function(sessionId, answerId) {
+    const filePath = this.data.recordedAudioPath;
+    if (!filePath) return;
+    uploadAnswerAudio({
+      sessionId,
+      answerId,
+      filePath,
+      success: (result) => {
+        this.setData({ answerAudioUrl: result.audio_url });
+      },
+      fail: (err) => {
+        console.error('Audio upload failed:', err);
+        wx.showToast({ title: '录音上传失败', icon: 'none' });
+      }
+    });
+  },
+
+  playAnswerAudio: function() {
+    if (!this.data.answerAudioUrl) return;
+    if (this.answerAudioContext) {
+      this.answerAudioContext.destroy();
+    }
+    // Served with Range support, so playback starts before the whole file has arrived
+    this.answerAudioContext = wx.createInnerAudioContext();
+    this.answerAudioContext.src = `${app.globalData.backendBaseUrl}${this.data.answerAudioUrl}`;
+    this.answerAudioContext.play();
+  },
+
 
 
   handleTextInput: function(e) {
@@ -554,13 +707,12 @@ Page({
     const currentQuestion = this.data.generatedQaList[this.data.currentQuestionIndex];
 
     wx.request({
-      url: `${backendBaseUrl}/interview_session/${currentInterviewSessionId}/answer`,
-      method: 'POST',
+      url: `${backendBaseUrl}/interview_session/${currentInterviewSessionId}/answers/${currentQuestion.answer_id}`,
+      method: 'PUT',
       header: {
         'Content-Type': 'application/json'
       },
       data: {
-        question_text: currentQuestion.question_text,
         user_answer_transcript: answerText,
       },
       success: (res) => {
@@ -571,6 +723,7 @@ Page({
             aiFeedback: res.data.ai_feedback,
             practiceState: 'feedback'
           });
+          this._uploadRecordedAnswer(currentInterviewSessionId, currentQuestion.answer_id);
         } else {
           wx.showToast({ title: '评估失败', icon: 'error' });
           console.error("Evaluation failed: ", res);
@@ -640,13 +793,23 @@ Page({
     wx.request({
       url: `${backendBaseUrl}/interview_session/${currentInterviewSessionId}/finish`,
       method: 'PUT',
+      data: {
+        mode: 'batch' // Evaluate all answers together in one AI call
+      },
       success: (res) => {
-        wx.hideLoading();
-        if (res.statusCode === 200) {
-          wx.showToast({ title: '评估报告已生成！', icon: 'success' });
-          this.setData({ activeTab: 'report' });
-          this.getInterviewEvaluationData(); // Fetch the newly generated report
+        if (res.statusCode === 202) {
+          // The evaluation runs as a background job; the report is ready once it succeeds
+          this._pollJob(res.data.id, () => {
+            wx.hideLoading();
+            wx.showToast({ title: '评估报告已生成！', icon: 'success' });
+            this.setData({ activeTab: 'report' });
+            this.getInterviewEvaluationData(); // Fetch the newly generated report
+          }, () => {
+            wx.hideLoading();
+            wx.showToast({ title: '生成评估报告失败', icon: 'error' });
+          });
         } else {
+          wx.hideLoading();
           wx.showToast({ title: '生成评估报告失败', icon: 'error' });
           console.error('Failed to finish interview session:', res);
         }
@@ -685,25 +848,37 @@ Page({
   }, 300), // 300ms debounce delay
 
   saveQaList: function() {
-    const id = this.data.opportunityId;
-    const backendBaseUrl = app.globalData.backendBaseUrl;
     const qaListToSave = this.data.generatedQaList.map(qa => {
       const { question_text, suggested_answer } = qa;
       return { question: question_text, suggested_answer: suggested_answer };
     });
+    const savedQaList = (this.data.opportunity.question_items || []).map(item => ({
+      question: item.question, suggested_answer: item.suggested_answer
+    }));
+    this._patchQaList(savedQaList, this.data.opportunity.qa_version, qaListToSave);
+  },
+
+  // Sends only the operations turning the last saved list into qaListToSave
+  _patchQaList: function(baseList, baseVersion, qaListToSave) {
+    const id = this.data.opportunityId;
+    const backendBaseUrl = app.globalData.backendBaseUrl;
 
     wx.request({
       url: `${backendBaseUrl}/opportunity/${id}/update_qa_content`,
-      method: 'PUT',
+      method: 'PATCH',
       data: {
-        qa_list: qaListToSave
+        base_version: baseVersion || 0,
+        patch: listPatch(baseList, qaListToSave)
       },
       success: (res) => {
         if (res.statusCode === 200) {
           this.setData({
-            'opportunity.generated_qa_json': JSON.stringify(qaListToSave) // Update the opportunity object
+            'opportunity.question_items': qaListToSave, // Update the opportunity object
+            'opportunity.qa_version': res.data.qa_version
           });
           wx.showToast({ title: '问答列表已保存！', icon: 'success' });
+        } else if (res.statusCode === 409) {
+          this._resolveQaConflict(res.data, baseList, qaListToSave);
         } else {
           wx.showToast({ title: '保存失败', icon: 'error' });
         }
@@ -714,6 +889,25 @@ Page({
     });
   },
 
+  _resolveQaConflict: function(current, baseList, qaListToSave) {
+    // Only the version moved (e.g. after a generation finished): resend against it
+    if (JSON.stringify(current.qa_list) === JSON.stringify(baseList)) {
+      this._patchQaList(current.qa_list, current.qa_version, qaListToSave);
+      return;
+    }
+    wx.showModal({
+      title: '问答已在别处修改',
+      content: '是否用当前内容覆盖？取消则载入最新内容。',
+      success: (modal) => {
+        if (modal.confirm) {
+          this._patchQaList(current.qa_list, current.qa_version, qaListToSave);
+        } else {
+          this.fetchOpportunityDetail();
+        }
+      }
+    });
+  },
+
   deleteQa: function(e) {
     const indexToDelete = e.currentTarget.dataset.index;
     wx.showModal({
@@ -751,15 +945,20 @@ Page({
   },
 
   saveResume: function() {
-    const newContent = this.data.editingResumeMd;
+    this._patchResume(this.data.opportunity.generated_resume_md, this.data.opportunity.resume_version, this.data.editingResumeMd);
+  },
+
+  // Sends only the splice turning the last saved resume into newContent
+  _patchResume: function(baseContent, baseVersion, newContent) {
     const id = this.data.opportunityId;
     const backendBaseUrl = app.globalData.backendBaseUrl;
 
     wx.request({
       url: `${backendBaseUrl}/opportunity/${id}/update_resume_content`,
-      method: 'PUT',
+      method: 'PATCH',
       data: {
-        resume_md: newContent
+        base_version: baseVersion || 0,
+        edits: textEdits(baseContent, newContent)
       },
       success: (res) => {
         if (res.statusCode === 200) {
@@ -769,9 +968,12 @@ Page({
             generatedResumeMd: newContent,
             resumeMarkdown: resumeMarkdown,
             isEditingResume: false,
-            'opportunity.generated_resume_md': newContent // Update the opportunity object
+            'opportunity.generated_resume_md': newContent, // Update the opportunity object
+            'opportunity.resume_version': res.data.resume_version
           });
           wx.showToast({ title: '简历已保存', icon: 'success' });
+        } else if (res.statusCode === 409) {
+          this._resolveResumeConflict(res.data, baseContent, newContent);
         } else {
           wx.showToast({ title: '保存失败', icon: 'error' });
         }
@@ -782,6 +984,26 @@ Page({
     });
   },
 
+  _resolveResumeConflict: function(current, baseContent, newContent) {
+    // Only the version moved (e.g. after a generation finished): resend against it
+    if (current.resume_md === (baseContent || '')) {
+      this._patchResume(current.resume_md, current.resume_version, newContent);
+      return;
+    }
+    wx.showModal({
+      title: '简历已在别处修改',
+      content: '是否用当前内容覆盖？取消则载入最新内容。',
+      success: (modal) => {
+        if (modal.confirm) {
+          this._patchResume(current.resume_md, current.resume_version, newContent);
+        } else {
+          this.setData({ isEditingResume: false });
+          this.fetchOpportunityDetail();
+        }
+      }
+    });
+  },
+
   downloadPdf: function() {
     const resumeMd = this.data.generatedResumeMd;
     if (!resumeMd) {
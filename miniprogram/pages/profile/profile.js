@@ -1,6 +1,7 @@
 // miniprogram/pages/profile/profile.js
 const app = getApp();
 const Towxml = require('../../towxml/main'); // Import towxml
+const { getWithETag } = require('../../utils/etag_request');
 
 Page({
   data: {
@@ -34,9 +35,8 @@ Page({
       return;
     }
 
-    wx.request({
+    getWithETag({
       url: `${backendBaseUrl}/users/${userOpenId}`, // Corrected endpoint
-      method: 'GET',
       success: (res) => {
         if (res.statusCode === 200 && res.data) {
           this.setData({
@@ -0,0 +1,95 @@
+// utils/audio_upload.js
+// Resumable upload of a recorded answer (POST /interview_session/<id>/answers/<id>/audio, then
+// PUT /audio_uploads/<upload_id>?offset=N per chunk). The file is read one chunk at a time, so
+// a long recording is never held in memory whole; after a failed or rejected chunk the server
+// is asked how much it has and the upload continues from there.
+
+const MAX_RETRIES = 3;
+
+const CONTENT_TYPES = { mp3: 'audio/mpeg', aac: 'audio/aac', m4a: 'audio/x-m4a', wav: 'audio/wav' };
+
+function contentTypeOf(filePath) {
+  const extension = (filePath.split('.').pop() || '').toLowerCase();
+  return CONTENT_TYPES[extension] || 'audio/mpeg';
+}
+
+// options: { sessionId, answerId, filePath, success({ audio_url, session_answer }), fail(err) }
+function uploadAnswerAudio(options) {
+  const app = getApp();
+  const baseUrl = app.globalData.backendBaseUrl;
+  const fs = wx.getFileSystemManager();
+  const { sessionId, answerId, filePath } = options;
+  const fail = (err) => { options.fail && options.fail(err); };
+
+  function sendChunk(upload, offset, retries) {
+    fs.readFile({
+      filePath,
+      position: offset,
+      length: Math.min(upload.chunk_size, upload.size - offset),
+      success: (file) => {
+        wx.request({
+          url: `${baseUrl}/audio_uploads/${upload.upload_id}?offset=${offset}`,
+          method: 'PUT',
+          header: { 'Content-Type': 'application/octet-stream' },
+          data: file.data,
+          success: (res) => {
+            if (res.statusCode === 200 && res.data.complete) {
+              options.success && options.success(res.data);
+            } else if (res.statusCode === 200) {
+              sendChunk(upload, res.data.offset, 0);
+            } else {
+              resume(upload, retries);
+            }
+          },
+          fail: () => resume(upload, retries)
+        });
+      },
+      fail
+    });
+  }
+
+  function resume(upload, retries) {
+    if (retries >= MAX_RETRIES) {
+      fail({ errMsg: 'audio upload failed', upload_id: upload.upload_id });
+      return;
+    }
+    setTimeout(() => {
+      wx.request({
+        url: `${baseUrl}/audio_uploads/${upload.upload_id}`,
+        method: 'GET',
+        success: (res) => {
+          if (res.statusCode === 200) {
+            sendChunk(upload, res.data.offset, retries + 1);
+          } else {
+            fail(res);
+          }
+        },
+        fail: () => resume(upload, retries + 1)
+      });
+    }, 1000 * (retries + 1));
+  }
+
+  fs.getFileInfo({
+    filePath,
+    success: (info) => {
+      wx.request({
+        url: `${baseUrl}/interview_session/${sessionId}/answers/${answerId}/audio`,
+        method: 'POST',
+        data: { size: info.size, content_type: contentTypeOf(filePath) },
+        success: (res) => {
+          if (res.statusCode !== 201) {
+            fail(res);
+            return;
+          }
+          sendChunk(res.data, res.data.offset, 0);
+        },
+        fail
+      });
+    },
+    fail
+  });
+}
+
+module.exports = {
+  uploadAnswerAudio
+};
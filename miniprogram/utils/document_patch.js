@@ -0,0 +1,89 @@
+// utils/document_patch.js
+// Edits in the formats the PATCH endpoints apply (backend/document_patch.py), so saving a
+// resume or Q&A list uploads what changed rather than the whole document.
+
+function isHighSurrogate(code) {
+  return code >= 0xd800 && code <= 0xdbff;
+}
+
+function isLowSurrogate(code) {
+  return code >= 0xdc00 && code <= 0xdfff;
+}
+
+// Text edits turning oldText into newText: one splice covering everything between the
+// common prefix and suffix, which is all a single edit session in a textarea produces.
+// Offsets are JavaScript string indices (UTF-16 code units), as the server expects.
+function textEdits(oldText, newText) {
+  oldText = oldText || '';
+  newText = newText || '';
+  if (oldText === newText) return [];
+
+  const shorter = Math.min(oldText.length, newText.length);
+  let start = 0;
+  while (start < shorter && oldText[start] === newText[start]) start++;
+  let end = 0;
+  while (end < shorter - start && oldText[oldText.length - 1 - end] === newText[newText.length - 1 - end]) end++;
+
+  // Never cut a surrogate pair in half
+  if (start > 0 && isHighSurrogate(oldText.charCodeAt(start - 1))) start--;
+  if (end > 0 && isLowSurrogate(oldText.charCodeAt(oldText.length - end))) end--;
+
+  return [{
+    offset: start,
+    delete: oldText.length - start - end,
+    insert: newText.slice(start, newText.length - end)
+  }];
+}
+
+function escapePointer(token) {
+  return String(token).replace(/~/g, '~0').replace(/\//g, '~1');
+}
+
+function sameItem(a, b) {
+  return JSON.stringify(a) === JSON.stringify(b);
+}
+
+// RFC 6902 operations turning oldList (array of flat objects) into newList. Unchanged items
+// at both ends are skipped; in between, items are compared position by position (changed
+// fields are replaced one by one), then the surplus is removed or the extra items added.
+function listPatch(oldList, newList) {
+  const shorter = Math.min(oldList.length, newList.length);
+  let prefix = 0;
+  while (prefix < shorter && sameItem(oldList[prefix], newList[prefix])) prefix++;
+  let suffix = 0;
+  while (suffix < shorter - prefix &&
+         sameItem(oldList[oldList.length - 1 - suffix], newList[newList.length - 1 - suffix])) suffix++;
+
+  const oldMiddle = oldList.length - prefix - suffix;
+  const newMiddle = newList.length - prefix - suffix;
+  const operations = [];
+  for (let i = prefix; i < prefix + Math.min(oldMiddle, newMiddle); i++) {
+    const before = oldList[i];
+    const after = newList[i];
+    if (sameItem(before, after)) continue;
+    const beforeKeys = Object.keys(before || {}).sort();
+    const afterKeys = Object.keys(after || {}).sort();
+    if (!before || !after || beforeKeys.join('\n') !== afterKeys.join('\n')) {
+      operations.push({ op: 'replace', path: `/${i}`, value: after });
+      continue;
+    }
+    afterKeys.forEach(key => {
+      if (before[key] !== after[key]) {
+        operations.push({ op: 'replace', path: `/${i}/${escapePointer(key)}`, value: after[key] });
+      }
+    });
+  }
+  const position = prefix + Math.min(oldMiddle, newMiddle);
+  for (let i = newMiddle; i < oldMiddle; i++) {
+    operations.push({ op: 'remove', path: `/${position}` });
+  }
+  for (let i = oldMiddle; i < newMiddle; i++) {
+    operations.push({ op: 'add', path: `/${prefix + i}`, value: newList[prefix + i] });
+  }
+  return operations;
+}
+
+module.exports = {
+  textEdits,
+  listPatch
+};
@@ -0,0 +1,55 @@
+// utils/etag_request.js
+// GET with ETag revalidation. wx.request has no HTTP cache, so the last body and ETag of
+// each URL are kept here and sent back as If-None-Match; when the server answers 304 the
+// caller's success callback receives the cached body as an ordinary 200 response (with
+// res.notModified set), so pages need no special handling.
+
+const cache = {}; // url + query string -> { etag, body }
+
+function cacheKey(url, data) {
+  const query = Object.keys(data || {}).sort()
+    .map(key => `${encodeURIComponent(key)}=${encodeURIComponent(data[key])}`)
+    .join('&');
+  return query ? `${url}?${query}` : url;
+}
+
+function headerValue(header, name) {
+  const key = Object.keys(header || {}).find(candidate => candidate.toLowerCase() === name);
+  return key ? header[key] : null;
+}
+
+function getWithETag({ url, data, header, success, fail, complete }) {
+  const key = cacheKey(url, data);
+  const cached = cache[key];
+  const requestHeader = Object.assign({}, header);
+  if (cached) {
+    requestHeader['If-None-Match'] = cached.etag;
+  }
+
+  wx.request({
+    url,
+    method: 'GET',
+    data,
+    header: requestHeader,
+    success: (res) => {
+      if (res.statusCode === 304 && cached) {
+        // Hand out a copy, callers decorate the body they receive
+        res = Object.assign({}, res, { statusCode: 200, data: JSON.parse(cached.body), notModified: true });
+      } else if (res.statusCode === 200) {
+        const etag = headerValue(res.header, 'etag');
+        if (etag) {
+          cache[key] = { etag, body: JSON.stringify(res.data) };
+        } else {
+          delete cache[key];
+        }
+      }
+      if (success) success(res);
+    },
+    fail,
+    complete
+  });
+}
+
+module.exports = {
+  getWithETag
+};
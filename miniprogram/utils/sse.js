@@ -0,0 +1,92 @@
+// utils/sse.js
+// Minimal Server-Sent Events client on top of wx.request's chunked transfer mode.
+// Calls onEvent(event, data) for every complete event as chunks arrive; data is the
+// parsed JSON payload. On base libraries without chunked support the whole body is
+// parsed once the request completes, so callers still get every event.
+
+// Incremental UTF-8 decoder: a multi-byte character may be split across two chunks
+function createUtf8Decoder() {
+  let pending = [];
+  return function decode(arrayBuffer) {
+    const bytes = pending.concat(Array.from(new Uint8Array(arrayBuffer)));
+    let text = '';
+    let i = 0;
+    while (i < bytes.length) {
+      const byte = bytes[i];
+      const length = byte < 0x80 ? 1 : byte >= 0xf0 ? 4 : byte >= 0xe0 ? 3 : 2;
+      if (i + length > bytes.length) {
+        break; // Incomplete character, wait for the next chunk
+      }
+      let codePoint = length === 1 ? byte : byte & (0xff >> (length + 1));
+      for (let j = 1; j < length; j++) {
+        codePoint = (codePoint << 6) | (bytes[i + j] & 0x3f);
+      }
+      text += String.fromCodePoint(codePoint);
+      i += length;
+    }
+    pending = bytes.slice(i);
+    return text;
+  };
+}
+
+function createEventParser(onEvent) {
+  let buffer = '';
+  return function feed(text) {
+    buffer += text;
+    const blocks = buffer.split('\n\n');
+    buffer = blocks.pop();
+    blocks.forEach((block) => {
+      let event = 'message';
+      const dataLines = [];
+      block.split('\n').forEach((line) => {
+        if (line.startsWith('event:')) {
+          event = line.slice(6).trim();
+        } else if (line.startsWith('data:')) {
+          dataLines.push(line.slice(5).trim());
+        }
+      });
+      if (dataLines.length > 0) {
+        onEvent(event, JSON.parse(dataLines.join('\n')));
+      }
+    });
+  };
+}
+
+function requestEventStream({ url, method = 'POST', data = {}, onEvent, onComplete, onError }) {
+  const decode = createUtf8Decoder();
+  const feed = createEventParser(onEvent);
+  let receivedChunks = false;
+
+  const task = wx.request({
+    url,
+    method,
+    data,
+    enableChunked: true,
+    responseType: 'text',
+    success: (res) => {
+      if (res.statusCode !== 200) {
+        onError && onError(res);
+        return;
+      }
+      if (!receivedChunks && typeof res.data === 'string') {
+        feed(res.data + '\n\n');
+      }
+      onComplete && onComplete();
+    },
+    fail: (err) => {
+      onError && onError(err);
+    }
+  });
+
+  if (task && typeof task.onChunkReceived === 'function') {
+    task.onChunkReceived((res) => {
+      receivedChunks = true;
+      feed(decode(res.data));
+    });
+  }
+  return task;
+}
+
+module.exports = {
+  requestEventStream
+};
@@ -0,0 +1,91 @@
+// utils/sync.js
+// Local copy of the user's opportunities, interview sessions and answers, kept current with
+// GET /sync/<openid>?since=<cursor>: each call downloads only what changed since the last
+// one. The copy and its cursor are persisted in wx storage when they fit; otherwise they
+// live for the app session only and the next launch starts with a full sync.
+
+const STORAGE_KEY = 'syncState';
+const COLLECTIONS = ['opportunities', 'interview_sessions', 'session_answers'];
+
+let memoryState = null;
+
+function emptyState(openid, fields) {
+  return { openid, fields, cursor: null, opportunities: {}, interview_sessions: {}, session_answers: {} };
+}
+
+function loadState(openid, fields) {
+  let state = memoryState;
+  if (!state) {
+    try {
+      state = wx.getStorageSync(STORAGE_KEY) || null;
+    } catch (e) {
+      state = null;
+    }
+  }
+  // A different user or opportunity projection cannot be patched incrementally
+  if (!state || state.openid !== openid || state.fields !== fields) {
+    state = emptyState(openid, fields);
+  }
+  return state;
+}
+
+function saveState(state) {
+  memoryState = state;
+  try {
+    wx.setStorageSync(STORAGE_KEY, state);
+  } catch (e) {
+    console.warn('Sync state too large to persist, keeping it in memory only:', e);
+    try { wx.removeStorageSync(STORAGE_KEY); } catch (ignored) {}
+  }
+}
+
+function applyChanges(state, payload) {
+  if (payload.full) {
+    COLLECTIONS.forEach(name => { state[name] = {}; });
+  }
+  // Deletions first: an id can be reused by a row created after the delete
+  COLLECTIONS.forEach(name => {
+    (payload.deleted[name] || []).forEach(id => { delete state[name][id]; });
+  });
+  COLLECTIONS.forEach(name => {
+    payload[name].forEach(row => { state[name][row.id] = row; });
+  });
+  state.cursor = payload.cursor;
+}
+
+// options: { fields (optional opportunity projection), success(state), fail(err), complete() }
+// state.opportunities / interview_sessions / session_answers are objects keyed by id.
+function syncUserData(openid, options) {
+  const app = getApp();
+  const fields = options.fields || null;
+  const state = loadState(openid, fields);
+
+  const data = {};
+  if (state.cursor) data.since = state.cursor;
+  if (fields) data.fields = fields;
+
+  wx.request({
+    url: `${app.globalData.backendBaseUrl}/sync/${openid}`,
+    method: 'GET',
+    data,
+    success: (res) => {
+      if (res.statusCode !== 200) {
+        options.fail && options.fail(res);
+        return;
+      }
+      applyChanges(state, res.data);
+      saveState(state);
+      options.success && options.success(state);
+    },
+    fail: (err) => {
+      options.fail && options.fail(err);
+    },
+    complete: () => {
+      options.complete && options.complete();
+    }
+  });
+}
+
+module.exports = {
+  syncUserData
+};